@@ -0,0 +1 @@
+"""Offline benchmarks for the apps\x27 hot paths."""
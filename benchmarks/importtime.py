@@ -0,0 +1,102 @@
+"""Cold-start import profile of each app, from ``python -X importtime``.
+
+Collects the module-level imports of ``task*/app.py`` (the ones every cold
+start pays for; imports deferred into branches are not included), runs them in
+a fresh interpreter under ``-X importtime`` and reports the cumulative cost of
+each top-level package plus the slowest individual modules::
+
+    python -m benchmarks.importtime                 # all apps
+    python -m benchmarks.importtime task3 --top 15
+    python -m benchmarks.importtime --json > importtime.json
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = ("task1", "task2", "task3")
+
+
+def module_level_imports(script):
+    """Source of the import statements executed unconditionally by ``script``."""
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), script)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def profile(statements, python=sys.executable):
+    """Run ``statements`` under ``-X importtime``; return ``[(module, self_us, cumulative_us, depth)]``."""
+    code = "\n".join([f"import sys; sys.path.insert(0, {ROOT_DIR!r})", *statements])
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level after the bar
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def report(app, top=10, python=sys.executable):
+    script = os.path.join(ROOT_DIR, app, "app.py")
+    entries = profile(module_level_imports(script), python)
+    roots = sorted((e for e in entries if e[3] == 0), key=lambda e: -e[2])
+    return {
+        "app": app,
+        "total_ms": sum(e[2] for e in roots) / 1000,
+        "modules": len(entries),
+        "top_level": [{"module": name, "cumulative_ms": cum / 1000} for name, _, cum, _ in roots[:top]],
+        "slowest_self": [
+            {"module": name, "self_ms": own / 1000}
+            for name, own, _, _ in sorted(entries, key=lambda e: -e[1])[:top]
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("apps", nargs="*", metavar="app", help=f"any of {', '.join(APPS)} (default: all)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--python", default=sys.executable, help="interpreter to profile (default: this one)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.apps) - set(APPS))
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(unknown)}")
+
+    reports = []
+    for app in args.apps or APPS:
+        try:
+            reports.append(report(app, args.top, args.python))
+        except RuntimeError as exc:
+            reports.append({"app": app, "error": str(exc)})
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return 0
+    for rep in reports:
+        if "error" in rep:
+            print(f"== {rep['app']}: import failed: {rep['error']}\n")
+            continue
+        print(f"== {rep['app']}: {rep['total_ms']:.1f} ms, {rep['modules']} modules")
+        for entry in rep["top_level"]:
+            print(f"  {entry['module']:<40} {entry['cumulative_ms']:9.1f} ms")
+        print("  slowest modules (self time):")
+        for entry in rep["slowest_self"]:
+            print(f"    {entry['module']:<38} {entry['self_ms']:9.1f} ms")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
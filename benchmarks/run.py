@@ -0,0 +1,341 @@
+"""Offline latency/throughput benchmarks for the apps' hot paths.
+
+Times model loading, CSV parsing, task3 feature encoding, single-row vs batch
+prediction, figure rendering, the task3 analytics/heatmap summaries, the
+comparable-listings index, the what-if price surface and the dataset
+browser.
+Dataset-sized benchmarks run on synthetic Hyderabad-schema data scaled to
+1x, 10x and 100x the row count of ``task3/House Price India.csv`` (about
+1.5M rows at 100x).  Everything runs in-process; no Streamlit server or
+network is needed.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --scales 1 10 --baseline bench.json
+
+With ``--baseline`` the run exits with status 1 if any benchmark's median is
+slower than the baseline by more than ``--threshold`` (default 1.25x), or if
+any benchmark failed and was skipped: a crash is never a silent pass.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from common.analytics import build_summary  # noqa: E402
+from common.batch import predict_batch  # noqa: E402
+from common.browser import BrowseQuery, DatasetIndex  # noqa: E402
+from common.comparables import build_index  # noqa: E402
+from common.datasets import read_dataset  # noqa: E402
+from common.features import HouseFeatureEncoder  # noqa: E402
+from common.geo import build_heatmap_data  # noqa: E402
+from common.housing import HOUSING_DATASETS  # noqa: E402
+from common.inference import fast_predict  # noqa: E402
+from common.models import ModelRegistry  # noqa: E402
+from common.plots import draw_feature_grid  # noqa: E402
+from common.warmup import ADVERTISING_MODEL, IRIS_MODEL  # noqa: E402
+from common.whatif import build_surface, sweep  # noqa: E402
+
+MODEL_PATHS = {
+    "task1": IRIS_MODEL,
+    "task2": ADVERTISING_MODEL,
+    "task3": HOUSING_DATASETS["hyderabad"].model_path,
+}
+HYDERABAD_CSV = HOUSING_DATASETS["hyderabad"].csv_path
+INDIA_CSV = HOUSING_DATASETS["india"].csv_path
+# Legacy px.box/get_dummies paths are only timed up to this many rows
+LEGACY_MAX_ROWS = 50_000
+
+
+def measure(fn, repeat=5, warmup=1):
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times = np.array(times)
+    return {
+        "repeat": repeat,
+        "median_s": float(np.median(times)),
+        "min_s": float(times.min()),
+        "mean_s": float(times.mean()),
+        "p95_s": float(np.percentile(times, 95)),
+    }
+
+
+class Suite:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+        self.skipped = []
+
+    def bench(self, name, fn, scale=None, rows=None, repeat=None, warmup=1):
+        try:
+            result = measure(fn, repeat or self.repeat, warmup)
+        except Exception as exc:
+            self.skipped.append({"name": name, "scale": scale, "reason": f"{type(exc).__name__}: {exc}"})
+            return None
+        result.update({"name": name, "scale": scale, "rows": rows})
+        if rows:
+            result["rows_per_sec"] = rows / result["median_s"] if result["median_s"] > 0 else None
+        self.results.append(result)
+        return result
+
+
+def load_models():
+    models, errors = {}, {}
+    for name, path in MODEL_PATHS.items():
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                models[name] = ModelRegistry().get(path)
+        except Exception as exc:
+            errors[name] = f"{type(exc).__name__}: {exc}"
+    return models, errors
+
+
+def synthetic_hyderabad(base, n_rows, seed=0):
+    """Resample Hyderabad.csv to ``n_rows`` with +/-10% jitter on Area and Price."""
+    rng = np.random.default_rng(seed)
+    frame = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+    jitter = rng.uniform(0.9, 1.1, size=(n_rows, 2))
+    frame["Area"] = (frame["Area"].to_numpy() * jitter[:, 0]).astype("int32")
+    frame["Price"] = (frame["Price"].to_numpy() * jitter[:, 1]).astype("int32")
+    return frame
+
+
+def legacy_encode(model_pipeline, user_input):
+    # The per-request get_dummies + column loop the app used before the compiled encoder
+    encoded = pd.get_dummies(user_input, columns=['Location', 'Furnishing_Status'], drop_first=True)
+    for col in model_pipeline.feature_names_in_:
+        if col not in encoded.columns:
+            encoded[col] = 0
+    return encoded[model_pipeline.feature_names_in_]
+
+
+def bench_models(suite):
+    for name, path in MODEL_PATHS.items():
+        def cold_load(path=path):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                ModelRegistry().get(path)
+        suite.bench(f"model_load.cold.{name}", cold_load, repeat=3)
+        registry = ModelRegistry()
+        suite.bench(f"model_load.warm.{name}", lambda path=path: registry.get(path))
+
+
+def bench_predict(suite, models, scale, n_rows):
+    rng = np.random.default_rng(scale)
+    for name in ("task1", "task2"):
+        model = models.get(name)
+        if model is None:
+            continue
+        single = rng.normal(size=(1, model.n_features_in_))
+        batch = rng.normal(size=(n_rows, model.n_features_in_))
+        if scale == 1:
+            suite.bench(f"predict.single.{name}", lambda m=model, x=single: m.predict(x))
+            suite.bench(f"predict.single.compiled.{name}", lambda m=model, x=single: fast_predict(m, x), repeat=50)
+        suite.bench(f"predict.batch.{name}", lambda m=model, x=batch: predict_batch(m, x), scale, n_rows, repeat=3)
+
+
+def bench_task3(suite, models, frame, scale, csv_path):
+    n_rows = len(frame)
+    suite.bench("csv_parse.typed.hyderabad", lambda: read_dataset(csv_path, persist=False), scale, n_rows, repeat=3)
+    suite.bench("csv_parse.untyped.hyderabad", lambda: pd.read_csv(csv_path), scale, n_rows, repeat=3)
+    read_dataset(csv_path, persist=True)
+    suite.bench("csv_parse.sidecar.hyderabad", lambda: read_dataset(csv_path, persist=True), scale, n_rows, repeat=3)
+
+    suite.bench("analytics.summary", lambda: build_summary(frame), scale, n_rows, repeat=3)
+    suite.bench("heatmap.build", lambda: build_heatmap_data(frame), scale, n_rows, repeat=3)
+
+    summary = build_summary(frame)
+
+    def box_from_summary():
+        import plotly.graph_objects as go
+        stats = summary.location_stats
+        go.Figure(go.Box(
+            x=stats["Location"], q1=stats["q1"], median=stats["median"], q3=stats["q3"],
+            lowerfence=stats["lowerfence"], upperfence=stats["upperfence"],
+        )).to_json()
+    suite.bench("charts.box.summary", box_from_summary, scale, n_rows, repeat=3)
+    if n_rows <= LEGACY_MAX_ROWS:
+        def box_legacy():
+            import plotly.express as px
+            px.box(frame, x="Location", y="Price", color="Location").to_json()
+        suite.bench("charts.box.legacy", box_legacy, scale, n_rows, repeat=3)
+
+    model = models.get("task3")
+    if model is None:
+        return
+    encoder = HouseFeatureEncoder(model)
+    features = frame.drop(columns="Price")
+    record = {'Area': 1500, 'Location': 'Gachibowli', 'No. of Bedrooms': 3, 'Bathrooms': 2,
+              'CarParking': 1, 'Age_of_Property': 5, 'Furnishing_Status': 'Furnished'}
+    if scale == 1:
+        suite.bench("encode.single.compiled", lambda: encoder.transform(record), repeat=200)
+        suite.bench("encode.single.legacy", lambda: legacy_encode(model, pd.DataFrame([record])), repeat=50)
+        suite.bench("predict.single.task3", lambda: encoder.predict(record), repeat=200)
+        axes = {"Area": sweep(500, 10000, integer=True), "No. of Bedrooms": [1, 2, 3, 4, 5],
+                "Location": ["Nizampet", "Hitech City", "Manikonda", "Gachibowli", "Kukatpally"]}
+        suite.bench("whatif.surface.task3", lambda: build_surface(model, record, axes), repeat=20)
+    suite.bench("encode.batch.compiled", lambda: encoder.transform(features), scale, n_rows, repeat=3)
+    suite.bench("predict.batch.task3", lambda: encoder.predict(features), scale, n_rows, repeat=3)
+
+
+def scan_comparables(frame, record, k=5):
+    # The full-frame scan the neighbour index replaces: standardize, filter by location, sort
+    numeric = frame[["Area", "No. of Bedrooms"]].to_numpy(dtype=np.float64)
+    scaled = (numeric - numeric.mean(axis=0)) / numeric.std(axis=0)
+    query = (np.array([record["Area"], record["No. of Bedrooms"]]) - numeric.mean(axis=0)) / numeric.std(axis=0)
+    distance = np.sqrt(((scaled - query) ** 2).sum(axis=1))
+    distance[frame["Location"].to_numpy() != record["Location"]] = np.inf
+    return np.argsort(distance)[:k]
+
+
+def bench_comparables(suite, frame, scale):
+    n_rows = len(frame)
+    spec = HOUSING_DATASETS["hyderabad"]
+    suite.bench("comparables.build", lambda: build_index(frame, spec), scale, n_rows, repeat=3)
+    index = build_index(frame, spec)
+    record = {"Area": 1500, "Location": "Gachibowli", "No. of Bedrooms": 3}
+    suite.bench("comparables.single.index", lambda: index.query(record), scale, n_rows, repeat=200)
+    if n_rows <= LEGACY_MAX_ROWS:
+        suite.bench("comparables.single.scan", lambda: scan_comparables(frame, record), scale, n_rows, repeat=20)
+    queries = frame.drop(columns="Price").iloc[:1000]
+    suite.bench("comparables.batch.index", lambda: index.query(queries), scale, len(queries), repeat=3)
+
+
+def bench_browser(suite, frame, scale):
+    n_rows = len(frame)
+    suite.bench("browser.index", lambda: DatasetIndex(frame), scale, n_rows, repeat=3)
+    index = DatasetIndex(frame)
+    query = BrowseQuery(
+        filters=(("Location", ("Gachibowli", "Kondapur")),), ranges=(("Area", 1000, 2000),),
+        flags=("Gymnasium", "SwimmingPool"), sort="Price", descending=True,
+    )
+    suite.bench("browser.select", lambda: index.select(query), scale, n_rows, repeat=5)
+    if n_rows <= LEGACY_MAX_ROWS:
+        def select_legacy():
+            mask = (frame["Location"].isin(["Gachibowli", "Kondapur"]) & frame["Area"].between(1000, 2000)
+                    & (frame["Gymnasium"] == 1) & (frame["SwimmingPool"] == 1))
+            frame[mask].sort_values("Price", ascending=False)
+        suite.bench("browser.select.pandas", select_legacy, scale, n_rows, repeat=5)
+
+
+def bench_figures(suite):
+    df = pd.DataFrame({f"Feature {i + 1}": [float(v)] for i, v in enumerate([5.1, 3.5, 1.4, 0.2])})
+
+    def render():
+        from io import BytesIO
+        fig = draw_feature_grid(df, "#1f77b4")
+        fig.savefig(BytesIO(), format="png", dpi=100)
+        fig.clear()
+    suite.bench("figure.grid.render", render, repeat=3)
+
+
+def bench_india_parse(suite, scale, tmpdir):
+    base = pd.read_csv(INDIA_CSV)
+    path = os.path.join(tmpdir, f"india_x{scale}.csv")
+    pd.concat([base] * scale, ignore_index=True).to_csv(path, index=False)
+    suite.bench("csv_parse.untyped.india", lambda: pd.read_csv(path), scale, len(base) * scale, repeat=3)
+
+
+def compare(results, baseline, threshold):
+    previous = {(r["name"], r["scale"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result["name"], result["scale"]))
+        if before is None or not before["median_s"]:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        result["baseline_median_s"] = before["median_s"]
+        result["ratio"] = ratio
+        if ratio > threshold:
+            regressions.append({"name": result["name"], "scale": result["scale"], "ratio": ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    suite = Suite(args.repeat)
+    models, model_errors = load_models()
+    for name, error in model_errors.items():
+        suite.skipped.append({"name": f"model.{name}", "scale": None, "reason": error})
+
+    bench_models(suite)
+    bench_figures(suite)
+    base = read_dataset(HYDERABAD_CSV, persist=False)
+    india_rows = sum(1 for _ in open(INDIA_CSV, encoding="utf-8")) - 1
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for scale in args.scales:
+            n_rows = india_rows * scale
+            frame = synthetic_hyderabad(base, n_rows, seed=scale)
+            # Keep the file name so the registered Hyderabad.csv schema applies
+            os.makedirs(os.path.join(tmpdir, f"x{scale}"))
+            csv_path = os.path.join(tmpdir, f"x{scale}", "Hyderabad.csv")
+            frame.to_csv(csv_path, index=False)
+            bench_task3(suite, models, frame, scale, csv_path)
+            bench_comparables(suite, frame, scale)
+            bench_browser(suite, frame, scale)
+            bench_predict(suite, models, scale, n_rows)
+            bench_india_parse(suite, scale, tmpdir)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scales": args.scales,
+        },
+        "results": suite.results,
+        "skipped": suite.skipped,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(suite.results, json.load(f), args.threshold)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    for result in suite.results:
+        scale = f"x{result['scale']}" if result["scale"] else ""
+        ratio = f"  ({result['ratio']:.2f}x baseline)" if "ratio" in result else ""
+        print(f"{result['name']:<32}{scale:>6}  {result['median_s'] * 1000:10.3f} ms{ratio}", file=sys.stderr)
+    for skip in suite.skipped:
+        print(f"skipped {skip['name']}: {skip['reason']}", file=sys.stderr)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold}x baseline", file=sys.stderr)
+    if args.baseline and suite.skipped:
+        print(f"{len(suite.skipped)} benchmark(s) failed to run", file=sys.stderr)
+    return 1 if regressions or (args.baseline and suite.skipped) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Shared building blocks for the task1/task2/task3 Streamlit apps."""
@@ -0,0 +1,175 @@
+"""Precomputed summaries behind the task3 analytics charts.
+
+The charts used to hand the whole dataset to Plotly on every rerun, so the
+figure JSON grew with the number of listings.  The summaries here are computed
+once per dataset version and are bounded by the number of locations (box
+plot), amenities (bar chart) and a fixed point budget (scatter).
+
+Which columns feed each chart is described by ``ChartColumns``; the default
+is the Hyderabad layout, and ``common.housing`` gives every other listings
+dataset its own.  ``analytics_figures`` goes one step further and keeps the
+Plotly figures themselves, so a rerun only re-sends them.
+"""
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from common.cache import DerivedCache
+from common.browser import FLAG_VALUES
+from common.datasets import dataset_version, load_dataset
+
+AMENITIES = [
+    "Gymnasium", "SwimmingPool", "JoggingTrack", "ClubHouse", "SportsFacility",
+    "24X7Security", "PowerBackup", "LiftAvailable"
+]
+SCATTER_COLUMNS = ["Area", "Price", "Location", "No. of Bedrooms"]
+# Most points the Area vs Price scatter ships to the browser
+MAX_SCATTER_POINTS = 5000
+
+
+@dataclass(frozen=True)
+class ChartColumns:
+    """The columns behind the box plot, scatter and amenities charts."""
+
+    value: str = "Price"
+    group: str = "Location"
+    area: str = "Area"
+    hover: tuple = ("No. of Bedrooms",)
+    amenities: tuple = field(default=tuple(AMENITIES))
+
+    @property
+    def scatter(self):
+        return [self.area, self.value, self.group, *self.hover]
+
+
+HYDERABAD_CHARTS = ChartColumns()
+
+
+@dataclass
+class AnalyticsSummary:
+    location_stats: pd.DataFrame
+    amenity_counts: pd.DataFrame
+    scatter_sample: pd.DataFrame
+    total: int
+
+
+def location_box_stats(dataset, value="Price", by="Location"):
+    """Per-group box plot statistics (Tukey whiskers at 1.5 IQR, like Plotly's)."""
+    groups = dataset[by].astype(str)
+    values = dataset[value].astype(np.float64)
+    grouped = values.groupby(groups)
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ["q1", "median", "q3"]
+    stats["count"] = grouped.size()
+
+    # Whiskers reach the furthest observation inside the fences
+    iqr = stats["q3"] - stats["q1"]
+    low = (stats["q1"] - 1.5 * iqr).reindex(groups).to_numpy()
+    high = (stats["q3"] + 1.5 * iqr).reindex(groups).to_numpy()
+    inside = values.to_numpy()
+    stats["lowerfence"] = pd.Series(np.where(inside >= low, inside, np.nan)).groupby(groups.to_numpy()).min()
+    stats["upperfence"] = pd.Series(np.where(inside <= high, inside, np.nan)).groupby(groups.to_numpy()).max()
+    return stats.rename_axis(by).reset_index()
+
+
+def _has_amenity(series):
+    if not pd.api.types.is_numeric_dtype(series):
+        return series == "yes"
+    if set(series.dropna().unique().tolist()) <= FLAG_VALUES:
+        # Only 1 is present; Hyderabad's 9 means "not mentioned", as in the browser and comparables
+        return series == 1
+    # Counts such as India's number of views: any at all
+    return series > 0
+
+
+def amenity_counts(dataset, amenities=AMENITIES):
+    present = [amenity for amenity in amenities if amenity in dataset.columns]
+    # Properties that have each amenity, not the sum of its column
+    counts = [_has_amenity(dataset[amenity]).sum() for amenity in present]
+    return pd.DataFrame({"Amenity": present, "Count": np.asarray(counts, dtype=np.int64)})
+
+
+def scatter_sample(dataset, max_points=MAX_SCATTER_POINTS, seed=0, columns=SCATTER_COLUMNS):
+    """Deterministic uniform sample of the scatter columns, at most ``max_points`` rows."""
+    frame = dataset[[column for column in dict.fromkeys(columns) if column in dataset.columns]]
+    if len(frame) > max_points:
+        frame = frame.sample(n=max_points, random_state=seed)
+    return frame.reset_index(drop=True)
+
+
+def build_summary(dataset, max_points=MAX_SCATTER_POINTS, charts=HYDERABAD_CHARTS):
+    return AnalyticsSummary(
+        location_stats=location_box_stats(dataset, value=charts.value, by=charts.group),
+        amenity_counts=amenity_counts(dataset, charts.amenities),
+        scatter_sample=scatter_sample(dataset, max_points, columns=charts.scatter),
+        total=len(dataset),
+    )
+
+
+_summaries = DerivedCache()
+
+
+def analytics_summary(csv_path, max_points=MAX_SCATTER_POINTS, charts=HYDERABAD_CHARTS):
+    """Summary for ``csv_path``, rebuilt only when the dataset changes."""
+    key = (os.path.abspath(csv_path), max_points, charts)
+    return _summaries.get(key, dataset_version(csv_path), lambda: build_summary(
+        load_dataset(csv_path), max_points, charts
+    ))
+
+
+def build_figures(summary, charts=HYDERABAD_CHARTS):
+    """Plotly figures for the box plot, scatter and (when configured) amenities charts."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # One precomputed box per group, coloured like px.box(color=group) did
+    colors = px.colors.qualitative.Plotly
+    box = go.Figure([
+        go.Box(
+            x=[group], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+            lowerfence=[row["lowerfence"]], upperfence=[row["upperfence"]],
+            name=str(group), legendgroup=str(group), marker_color=colors[i % len(colors)],
+        )
+        for i, (group, row) in enumerate(summary.location_stats.set_index(charts.group).iterrows())
+    ])
+    box.update_layout(
+        title="Interactive Price Distribution",
+        xaxis_title=charts.group,
+        yaxis_title=charts.value,
+        legend_title_text=charts.group,
+        boxmode="overlay",
+        template="plotly_white"
+    )
+    scatter = px.scatter(
+        summary.scatter_sample,
+        x=charts.area,
+        y=charts.value,
+        color=charts.group,
+        size=charts.value,
+        hover_name=charts.group,
+        hover_data=[charts.value, charts.area, *charts.hover],
+        title="Interactive Scatterplot of Property Features",
+        template="plotly_white"
+    )
+    amenities = None
+    if charts.amenities:
+        amenities = px.bar(
+            summary.amenity_counts,
+            x="Amenity",
+            y="Count",
+            title="Count of Properties with Key Amenities",
+            template="plotly_white"
+        )
+    return {"box": box, "scatter": scatter, "amenities": amenities}
+
+
+_figures = DerivedCache()
+
+
+def analytics_figures(csv_path, max_points=MAX_SCATTER_POINTS, charts=HYDERABAD_CHARTS):
+    """``(summary, figures)`` for ``csv_path``; the figures are shared and must not be mutated."""
+    key = (os.path.abspath(csv_path), max_points, charts)
+    summary = analytics_summary(csv_path, max_points, charts)
+    return summary, _figures.get(key, dataset_version(csv_path), lambda: build_figures(summary, charts))
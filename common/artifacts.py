@@ -0,0 +1,198 @@
+"""Memory-mappable model artifacts with a checksum manifest.
+
+``export_artifact`` turns a joblib pickle such as ``model.pkl`` into a
+directory next to it, ``model.artifact/``::
+
+    manifest.json      format, source checksum, library versions, file checksums
+    model.joblib       uncompressed joblib dump; NumPy arrays are memory-mapped on load
+    <name>.npy         optional flat arrays (e.g. tree node tables), memory-mapped
+
+Memory-mapped arrays live in the page cache, so every worker process that
+loads the same artifact shares one physical copy instead of unpickling its own.
+
+``load_artifact`` refuses an artifact whose files do not match the manifest
+checksums, whose source pickle has changed since export, or that was exported
+with a different scikit-learn release; ``common.models`` then falls back to the
+source pickle.  Export or check artifacts from the command line::
+
+    python -m common.artifacts export task1/model.pkl task2/LR_model.pkl task3/house_price_model.pkl
+    python -m common.artifacts verify task1/model.pkl
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+
+FORMAT = "orinson-model-artifact"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+MODEL_FILE = "model.joblib"
+SUFFIX = ".artifact"
+
+
+class ArtifactError(Exception):
+    """The artifact is missing, corrupt, stale or incompatible."""
+
+
+def artifact_path(source):
+    """``dir/model.pkl`` -> ``dir/model.artifact``."""
+    return os.path.splitext(os.path.abspath(source))[0] + SUFFIX
+
+
+def sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sklearn_version():
+    try:
+        import sklearn
+    except ImportError:
+        return None
+    return sklearn.__version__
+
+
+def _release(version):
+    # Pickles are only compatible within a major.minor release
+    return ".".join(str(version).split(".")[:2]) if version else None
+
+
+@dataclass
+class Artifact:
+    path: str
+    manifest: dict
+    model: object
+    arrays: dict = field(default_factory=dict)
+
+
+def export_artifact(source, dest=None, model=None, arrays=None):
+    """Write the artifact for the pickle ``source`` and return its directory.
+
+    ``model`` defaults to ``joblib.load(source)``; ``arrays`` maps names to
+    extra NumPy arrays stored as standalone ``.npy`` files.
+    """
+    import joblib
+    import numpy as np
+
+    dest = dest or artifact_path(source)
+    if model is None:
+        model = joblib.load(source)
+    # Build in a sibling directory and swap it in, so readers never see half an artifact
+    tmp = dest + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        joblib.dump(model, os.path.join(tmp, MODEL_FILE), compress=0)
+        for name, array in (arrays or {}).items():
+            np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(array), allow_pickle=False)
+        files = {
+            name: {"sha256": sha256(os.path.join(tmp, name)), "size": os.path.getsize(os.path.join(tmp, name))}
+            for name in sorted(os.listdir(tmp))
+        }
+        manifest = {
+            "format": FORMAT,
+            "format_version": FORMAT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "source": {"name": os.path.basename(source), "sha256": sha256(source)},
+            "model_class": f"{type(model).__module__}.{type(model).__qualname__}",
+            "n_features_in": int(getattr(model, "n_features_in_", 0)) or None,
+            "feature_names_in": [str(name) for name in getattr(model, "feature_names_in_", [])] or None,
+            "versions": {"sklearn": _sklearn_version(), "joblib": joblib.__version__, "numpy": np.__version__},
+            "files": files,
+            "arrays": sorted(arrays or {}),
+        }
+        with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        shutil.rmtree(dest, ignore_errors=True)
+        os.replace(tmp, dest)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return dest
+
+
+def read_manifest(path):
+    try:
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as exc:
+        raise ArtifactError(f"unreadable manifest in {path}: {exc}") from exc
+    if manifest.get("format") != FORMAT or manifest.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(f"{path} is not a version {FORMAT_VERSION} model artifact")
+    return manifest
+
+
+def verify_artifact(path, source=None):
+    """Check ``path`` against its manifest (and ``source``); return the manifest."""
+    manifest = read_manifest(path)
+    for name, expected in manifest["files"].items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            raise ArtifactError(f"{name} is missing from {path}")
+        if os.path.getsize(file_path) != expected["size"] or sha256(file_path) != expected["sha256"]:
+            raise ArtifactError(f"{name} in {path} does not match its manifest checksum")
+    if source is not None and os.path.exists(source) and sha256(source) != manifest["source"]["sha256"]:
+        raise ArtifactError(f"{path} is stale: {os.path.basename(source)} changed after export")
+    exported, current = manifest["versions"].get("sklearn"), _sklearn_version()
+    if _release(exported) != _release(current):
+        raise ArtifactError(f"{path} was exported with scikit-learn {exported}, running {current}")
+    return manifest
+
+
+def load_artifact(path, source=None, verify=True, mmap_mode="r"):
+    """Load a verified artifact; arrays are read-only memory maps by default."""
+    import joblib
+    import numpy as np
+
+    manifest = verify_artifact(path, source) if verify else read_manifest(path)
+    model = joblib.load(os.path.join(path, MODEL_FILE), mmap_mode=mmap_mode)
+    arrays = {
+        name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        for name in manifest["arrays"]
+    }
+    return Artifact(path, manifest, model, arrays)
+
+
+def compiled_arrays(source):
+    """Flat node tables for ``common.inference`` when the model compiles, else ``None``."""
+    import joblib
+
+    from common.inference import NotCompilable, compile_model
+
+    try:
+        return compile_model(joblib.load(source)).arrays() or None
+    except NotCompilable:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("sources", nargs="+", help="joblib model pickles")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for source in args.sources:
+        try:
+            if args.command == "export":
+                path = export_artifact(source, arrays=compiled_arrays(source))
+                size = sum(entry["size"] for entry in read_manifest(path)["files"].values())
+                print(f"{source}: wrote {path} ({size:,} bytes)")
+            else:
+                manifest = verify_artifact(artifact_path(source), source)
+                print(f"{source}: ok ({manifest['model_class']}, exported {manifest['created']})")
+        except (ArtifactError, OSError, ValueError, AttributeError, ImportError) as exc:
+            failed += 1
+            print(f"{source}: {type(exc).__name__}: {exc}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
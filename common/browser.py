@@ -0,0 +1,220 @@
+"""Paginated, filtered views of a dataset that stay on the server.
+
+The apps used to send whole frames (or a fixed head) to the browser.  Here a
+``DatasetIndex`` is built once per dataset version:
+
+* categorical columns keep their factorized codes, so a category filter is
+  one table lookup per row;
+* numeric columns keep their sort order and sorted values, so a range filter
+  is two binary searches, and sorting a selection never re-sorts;
+* 0/1 (or yes/no) amenity columns are packed into per-row bitmasks, so
+  "must have these amenities" is one AND per row.
+
+``browse`` keeps the selected row positions of recent queries in a bounded
+LRU (exported as ``cache="browser"``), so paging through a result only slices
+it, and only the requested page is ever rendered.
+"""
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.cache import DerivedCache, LRUCache
+from common.datasets import dataset_version, load_dataset
+from common.telemetry import metrics
+
+PAGE_SIZE = 10
+MAX_SELECTIONS = 128
+# Values of a numeric amenity flag; Hyderabad's 9 means "not mentioned"
+FLAG_VALUES = {0, 1, 9}
+
+_selections = LRUCache(max_entries=MAX_SELECTIONS)
+metrics.track_cache("browser", _selections)
+
+
+def _flag(series):
+    """Presence array when ``series`` is a 1/0 or yes/no column, else ``None``."""
+    values = series.dropna()
+    if pd.api.types.is_bool_dtype(series):
+        return series.fillna(False).to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(series):
+        if len(values) and set(np.unique(values).tolist()) <= FLAG_VALUES:
+            return series.to_numpy() == 1
+        return None
+    if len(values) and set(values.astype(str).unique()) <= {"yes", "no"}:
+        return (series.astype(str) == "yes").to_numpy()
+    return None
+
+
+@dataclass(frozen=True)
+class BrowseQuery:
+    # ((column, (category, ...)), ...): keep rows in any of the categories
+    filters: tuple = ()
+    # ((column, low, high), ...): keep rows with low <= value <= high
+    ranges: tuple = ()
+    # Flag columns every kept row must have
+    flags: tuple = ()
+    sort: str = None
+    descending: bool = False
+
+
+@dataclass
+class BrowserPage:
+    rows: pd.DataFrame
+    matched: int
+    total: int
+    page: int
+    pages: int
+    start: int
+
+
+class DatasetIndex:
+    """Per-column filter and sort structures over one frame."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.size = len(frame)
+        self.categorical = {}   # column -> (codes, categories); code -1 is missing
+        self.numeric = {}       # column -> (order, sorted values, rows with a value)
+        self.flags = []
+        present = []
+        for column in frame.columns:
+            series = frame[column]
+            flag = _flag(series)
+            if flag is not None:
+                self.flags.append(column)
+                present.append(flag)
+            elif pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                order = np.argsort(values, kind="stable")
+                self.numeric[column] = (order, values[order], int(np.count_nonzero(~np.isnan(values))))
+            else:
+                codes, categories = pd.factorize(series, sort=True)
+                self.categorical[column] = (codes, categories.tolist())
+        self.bits = np.zeros((self.size, max(1, math.ceil(len(present) / 64))), dtype=np.uint64)
+        for i, flag in enumerate(present):
+            self.bits[flag, i // 64] |= np.uint64(1 << (i % 64))
+        self._orders = {}
+
+    def bounds(self, column):
+        _, values, valid = self.numeric[column]
+        return (values[0], values[valid - 1]) if valid else (np.nan, np.nan)
+
+    def _order(self, column):
+        # Row positions by ``column``, missing values last, and how many have a value
+        if column in self.numeric:
+            order, _, valid = self.numeric[column]
+            return order, valid
+        order = self._orders.get(column)
+        if order is None:
+            if column in self.categorical:
+                codes, categories = self.categorical[column]
+                keys = np.where(codes < 0, len(categories), codes)
+                order = (np.argsort(keys, kind="stable"), int(np.count_nonzero(codes >= 0)))
+            else:
+                present = self.bits[:, self.flags.index(column) // 64] >> np.uint64(self.flags.index(column) % 64)
+                order = (np.argsort(present & np.uint64(1), kind="stable"), self.size)
+            self._orders[column] = order
+        return order
+
+    def select(self, query):
+        """Positions of the rows matching ``query``, in its sort order."""
+        mask = np.ones(self.size, dtype=bool)
+        for column, chosen in query.filters:
+            codes, categories = self.categorical[column]
+            # One extra slot so missing values (code -1) never match
+            lookup = np.zeros(len(categories) + 1, dtype=bool)
+            lookup[[categories.index(value) for value in chosen if value in categories]] = True
+            mask &= lookup[codes]
+        for column, low, high in query.ranges:
+            order, values, valid = self.numeric[column]
+            inside = np.zeros(self.size, dtype=bool)
+            inside[order[np.searchsorted(values[:valid], low, "left"):np.searchsorted(values[:valid], high, "right")]] = True
+            mask &= inside
+        if query.flags:
+            required = np.zeros(self.bits.shape[1], dtype=np.uint64)
+            for column in query.flags:
+                i = self.flags.index(column)
+                required[i // 64] |= np.uint64(1 << (i % 64))
+            mask &= ((self.bits & required) == required).all(axis=1)
+        if query.sort is None:
+            return np.flatnonzero(mask)
+        order, valid = self._order(query.sort)
+        if query.descending:
+            # Missing values stay last
+            order = np.concatenate([order[:valid][::-1], order[valid:]])
+        return order[mask[order]]
+
+
+_indexes = DerivedCache()
+
+
+def dataset_index(csv_path):
+    """The browser index over ``csv_path``, rebuilt only when the dataset changes."""
+    return _indexes.get(
+        os.path.abspath(csv_path), dataset_version(csv_path), lambda: DatasetIndex(load_dataset(csv_path))
+    )
+
+
+def browse(csv_path, query=BrowseQuery(), page=1, page_size=PAGE_SIZE):
+    """Page ``page`` (1-based, clamped) of the rows of ``csv_path`` matching ``query``."""
+    index = dataset_index(csv_path)
+    key = (os.path.abspath(csv_path), dataset_version(csv_path), query)
+    ids = _selections.get_or_build(key, lambda: index.select(query))
+    pages = max(1, math.ceil(len(ids) / page_size))
+    page = min(max(int(page), 1), pages)
+    start = (page - 1) * page_size
+    rows = index.frame.iloc[ids[start:start + page_size]]
+    return BrowserPage(rows, len(ids), index.size, page, pages, start)
+
+
+def slider_bounds(index, column):
+    """Range slider bounds for ``column``: ints for an integer column, floats for any other.
+
+    Both bounds take the column's type; ``st.slider`` rejects a mix such as ``(0, 49.6)``.
+    """
+    cast = int if pd.api.types.is_integer_dtype(index.frame[column]) else float
+    return tuple(cast(bound) for bound in index.bounds(column))
+
+
+def show_dataset_browser(csv_path, key, page_size=PAGE_SIZE):
+    """Filter controls, the current page and a pager for ``csv_path``, keyed by ``key``.
+
+    Call it from a fragment so that browsing reruns only the browser.
+    """
+    import streamlit as st
+
+    index = dataset_index(csv_path)
+    filters, ranges = [], []
+    with st.expander("🔎 Search and filter"):
+        for column, (_, categories) in index.categorical.items():
+            chosen = st.multiselect(column, categories, key=f"{key}:in:{column}")
+            if chosen:
+                filters.append((column, tuple(chosen)))
+        if index.numeric:
+            column = st.selectbox("Range on", [None, *index.numeric], key=f"{key}:range",
+                                  format_func=lambda column: "—" if column is None else column)
+            if column is not None:
+                low, high = slider_bounds(index, column)
+                if low < high:
+                    chosen = st.slider(column, low, high, (low, high), key=f"{key}:range:{column}")
+                    if chosen != (low, high):
+                        ranges.append((column, *chosen))
+        flags = st.multiselect("Must have", index.flags, key=f"{key}:flags") if index.flags else []
+        sort = st.selectbox("Sort by", [None, *index.frame.columns], key=f"{key}:sort",
+                            format_func=lambda column: "—" if column is None else column)
+        descending = st.checkbox("Descending", key=f"{key}:descending")
+
+    query = BrowseQuery(tuple(filters), tuple(ranges), tuple(flags), sort, descending)
+    page = browse(csv_path, query, st.session_state.get(f"{key}:page", 1), page_size)
+    # A narrower filter can leave the pager past the last page
+    st.session_state[f"{key}:page"] = page.page
+    st.dataframe(page.rows)
+    st.number_input("Page", min_value=1, max_value=page.pages, step=1, key=f"{key}:page")
+    if page.matched:
+        st.caption(f"Rows {page.start + 1:,}–{page.start + len(page.rows):,} of {page.matched:,} matching "
+                   f"({page.total:,} in the dataset).")
+    else:
+        st.caption(f"No rows match ({page.total:,} in the dataset).")
@@ -0,0 +1,143 @@
+"""File-backed caches that survive Streamlit reruns.
+
+Streamlit re-executes an app script on every widget interaction, but modules
+imported by the script stay in ``sys.modules``.  Caches kept at module level
+are therefore shared by every rerun and every session in the process.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def file_signature(path):
+    """Return ``(mtime_ns, size)`` for ``path``; changes whenever the file does."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class FileCache:
+    """Cache of objects built from files, keyed by absolute path.
+
+    Each entry remembers the file's modification time and size; when either
+    changes the object is rebuilt on the next ``get`` (hot reload).
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def signature(self, path):
+        """What ``get`` compares to decide whether ``path`` must be reloaded."""
+        return file_signature(path)
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        signature = self.signature(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with self._lock:
+            # Another session may have loaded it while we waited for the lock
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            value = self._loader(path)
+            self._entries[path] = (signature, value)
+            return value
+
+    def version(self, path):
+        """Return an opaque token that changes whenever the file changes."""
+        path = os.path.abspath(path)
+        signature = self.signature(path)
+        return f"{os.path.basename(path)}:" + ":".join(map(str, signature))
+
+    def evict(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def loaded(self):
+        return list(self._entries)
+
+
+class DerivedCache:
+    """Results computed from a versioned input, rebuilt when the version changes.
+
+    ``version`` is typically ``dataset_version(path)`` (or a tuple of several
+    such tokens); only the latest version is kept per key.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version, build):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            value = build()
+            self._entries[key] = (version, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LRUCache:
+    """Thread-safe, bounded least-recently-used cache with hit/miss counters.
+
+    With ``ttl`` (seconds) set, entries older than that count as misses and
+    are rebuilt.
+    """
+
+    def __init__(self, max_entries=64, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or time.monotonic() - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+        value = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,151 @@
+"""Comparable listings for a task3 property, from a prebuilt neighbour index.
+
+Every listing is placed in a feature space built from its dataset's
+``neighbours`` columns (standardized over the whole dataset) and its amenity
+``flags`` (0/1, each worth ``FLAG_WEIGHT`` standard deviations).  One KD-tree
+is built per value of the ``partition`` column (the location) and one over
+all listings, once per dataset version.  A lookup searches the property's own
+partition and tops up from the global tree when that partition has fewer
+than ``k`` listings or is unknown, so no query scans the frame.
+
+Inputs the property does not give (the Hyderabad sidebar has no amenities)
+take the average of its partition, so they pull the search neither way.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from common.cache import DerivedCache
+from common.datasets import dataset_version, load_dataset
+from common.features import as_columns
+from common.housing import dataset_for_csv
+
+# Distance one differing amenity adds, in standard deviations of the numeric columns
+FLAG_WEIGHT = 0.5
+DEFAULT_K = 5
+DISTANCE_COLUMN = "Distance"
+
+
+def _flag(values):
+    # 1/0 flags (Hyderabad's 9, "not mentioned", counts as absent) or yes/no
+    values = np.asarray(values)
+    if values.dtype.kind in "biuf":
+        return (values == 1).astype(np.float64)
+    return np.array([value == "yes" for value in values.tolist()], dtype=np.float64)
+
+
+class ComparablesIndex:
+    """KD-trees over a listings frame, one per partition plus one over everything."""
+
+    def __init__(self, frame, neighbours, flags=(), partition=""):
+        from sklearn.neighbors import KDTree
+
+        self.neighbours = [column for column in neighbours if column in frame.columns]
+        self.flags = [column for column in flags if column in frame.columns]
+        self.partition = partition if partition in frame.columns else ""
+        numeric = frame[self.neighbours].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        self.center = np.nanmean(numeric, axis=0) if len(frame) else np.zeros(len(self.neighbours))
+        scale = np.nanstd(numeric, axis=0) if len(frame) else np.ones(len(self.neighbours))
+        self.scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+
+        columns, n_rows = as_columns(frame[self.neighbours + self.flags])
+        # Listings missing a value sit at the dataset average for it
+        points = np.nan_to_num(self._points(columns, n_rows), nan=0.0)
+        self.size = n_rows
+        self._all = (KDTree(points), np.arange(n_rows))
+        self._fill = {None: points.mean(axis=0) if n_rows else np.zeros(points.shape[1])}
+        self._trees = {}
+        if self.partition:
+            codes, keys = pd.factorize(frame[self.partition].astype(str))
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+            for code, key in enumerate(keys):
+                members = order[bounds[code]:bounds[code + 1]]
+                self._trees[key] = (KDTree(points[members]), members)
+                self._fill[key] = points[members].mean(axis=0)
+
+    def _points(self, columns, n_rows):
+        points = np.full((n_rows, len(self.neighbours) + len(self.flags)), np.nan)
+        for i, column in enumerate(self.neighbours):
+            if column in columns:
+                values = np.asarray(pd.to_numeric(columns[column], errors="coerce"), dtype=np.float64)
+                points[:, i] = (values - self.center[i]) / self.scale[i]
+        for i, column in enumerate(self.flags, start=len(self.neighbours)):
+            if column in columns:
+                points[:, i] = _flag(columns[column]) * FLAG_WEIGHT
+        return points
+
+    def query(self, rows, k=DEFAULT_K):
+        """``(ids, distances)`` of the ``k`` listings nearest each of ``rows``, nearest first.
+
+        ``rows`` is a record, a list of records or a DataFrame.  ``ids`` are row
+        positions in the indexed frame; listings of the row's own partition come
+        first.  When the dataset has fewer than ``k`` listings the rest of each
+        row is padded with -1 and ``inf``.
+        """
+        columns, n_rows = as_columns(rows)
+        points = self._points(columns, n_rows)
+        if self.partition in columns:
+            keys = np.array([str(value) for value in columns[self.partition]], dtype=object)
+        else:
+            keys = np.full(n_rows, None, dtype=object)
+        ids = np.full((n_rows, k), -1, dtype=np.intp)
+        distances = np.full((n_rows, k), np.inf)
+        for key in dict.fromkeys(keys.tolist()):
+            selected = np.flatnonzero(keys == key) if key is not None else np.arange(n_rows)
+            tree, members = self._trees.get(key, self._all)
+            fill = self._fill.get(key, self._fill[None])
+            queries = np.where(np.isnan(points[selected]), fill, points[selected])
+            found = min(k, len(members))
+            if found:
+                distance, position = tree.query(queries, k=found)
+                ids[selected, :found] = members[position]
+                distances[selected, :found] = distance
+            wanted = min(k, self.size) - found
+            if wanted > 0:
+                # Too few listings in this partition: top up from all the others
+                distance, position = self._all[0].query(queries, k=min(self.size, found + k))
+                outside = ~np.isin(position, members)
+                first = np.argsort(~outside, axis=1, kind="stable")[:, :wanted]
+                ids[selected, found:found + wanted] = np.take_along_axis(position, first, axis=1)
+                distances[selected, found:found + wanted] = np.take_along_axis(distance, first, axis=1)
+        return ids, distances
+
+
+def build_index(dataset, spec):
+    return ComparablesIndex(dataset, spec.neighbours, spec.flags, spec.partition)
+
+
+_indexes = DerivedCache()
+
+
+def _spec(csv_path, spec):
+    spec = spec or dataset_for_csv(csv_path)
+    if spec is None:
+        raise KeyError(f"{os.path.basename(csv_path)} is not a registered listings dataset")
+    return spec
+
+
+def comparables_index(csv_path, spec=None):
+    """Neighbour index over ``csv_path``, rebuilt only when the dataset changes.
+
+    ``spec`` is the ``common.housing`` dataset; by default it is looked up by
+    file name.
+    """
+    spec = _spec(csv_path, spec)
+    key = (os.path.abspath(csv_path), spec.key)
+    return _indexes.get(key, dataset_version(csv_path), lambda: build_index(load_dataset(csv_path), spec))
+
+
+def comparable_listings(csv_path, row, k=DEFAULT_K, spec=None):
+    """The ``k`` listings most like the record ``row``, nearest first, with their ``Distance``."""
+    spec = _spec(csv_path, spec)
+    ids, distances = comparables_index(csv_path, spec).query(row, k)
+    found = ids[0] >= 0
+    dataset = load_dataset(csv_path)
+    columns = [
+        column for column in dict.fromkeys((spec.partition, spec.target, *spec.neighbours))
+        if column in dataset.columns
+    ]
+    return dataset[columns].iloc[ids[0][found]].assign(**{DISTANCE_COLUMN: distances[0][found]})
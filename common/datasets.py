@@ -0,0 +1,143 @@
+"""Typed, memoized dataset loading for the CSVs the apps read.
+
+Each CSV is parsed once per process with explicit compact dtypes and shared by
+every session until the file changes.  When pyarrow is available a Parquet
+sidecar is written next to the CSV (in ``__datacache__/``) so later cold starts
+skip the CSV parser entirely.
+
+The returned frames are shared between sessions: callers must treat them as
+read-only and ``copy()`` before mutating.
+"""
+import importlib.util
+import os
+
+import pandas as pd
+
+from common.cache import FileCache, file_signature
+
+# Probe without importing: pyarrow is only loaded once a sidecar is read or written
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+SIDECAR_DIR = "__datacache__"
+
+
+def _hyderabad_dtypes(columns):
+    # Everything other than Price/Area/Location is a small count or an amenity
+    # flag (0/1, with 9 meaning "not mentioned"), so uint8 is enough.
+    dtypes = {column: "uint8" for column in columns}
+    dtypes.update({"Price": "int32", "Area": "int32", "Location": "category"})
+    return dtypes
+
+
+def _advertising_dtypes(columns):
+    return {column: "float64" for column in columns}
+
+
+def _india_dtypes(columns):
+    # Counts, areas, years and prices are integral and fit int32
+    dtypes = {column: "int32" for column in columns}
+    dtypes.update({
+        "id": "int64", "number of bathrooms": "float32", "number of floors": "float32",
+        "Lattitude": "float64", "Longitude": "float64", "Postal Code": "category",
+    })
+    return dtypes
+
+
+def _housing_dtypes(columns):
+    # yes/no flags and the furnishing status are categories
+    dtypes = {column: "category" for column in columns}
+    dtypes.update({"price": "int32", "area": "int32"})
+    dtypes.update({column: "uint8" for column in ("bedrooms", "bathrooms", "stories", "parking")})
+    return dtypes
+
+
+def _listings_dtypes(columns):
+    dtypes = {column: "float64" for column in columns}
+    dtypes.update({columns[0]: "int32", "beds": "uint8", "zip_code": "category"})
+    return dtypes
+
+
+# Explicit schemas keyed by file name; unknown files fall back to pandas inference
+SCHEMAS = {
+    "Hyderabad.csv": _hyderabad_dtypes,
+    "Advertising.csv": _advertising_dtypes,
+    "House Price India.csv": _india_dtypes,
+    "Housing.csv": _housing_dtypes,
+    "House Price Prediction final dataset.csv": _listings_dtypes,
+}
+
+
+def _read_header(path):
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def dataset_dtypes(path, name=None):
+    """The column dtypes registered for ``name`` (default: ``path``'s file name), or ``None``."""
+    schema = SCHEMAS.get(name or os.path.basename(path))
+    return schema(_read_header(path)) if schema else None
+
+
+def sidecar_path(path):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, SIDECAR_DIR, name + ".parquet")
+
+
+def _read_sidecar(path):
+    sidecar = sidecar_path(path)
+    if not HAS_PARQUET or not os.path.exists(sidecar):
+        return None
+    # The sidecar is only trusted if it was written after the CSV last changed
+    if os.stat(sidecar).st_mtime_ns < file_signature(path)[0]:
+        return None
+    try:
+        return pd.read_parquet(sidecar)
+    except Exception:
+        return None
+
+
+def _write_sidecar(path, frame):
+    if not HAS_PARQUET:
+        return
+    sidecar = sidecar_path(path)
+    try:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        tmp_path = sidecar + ".tmp"
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        # Read-only deployments simply go without the sidecar
+        pass
+
+
+def read_dataset(path, persist=True):
+    """Parse ``path`` with its registered schema, bypassing every cache but the sidecar."""
+    if persist:
+        frame = _read_sidecar(path)
+        if frame is not None:
+            return frame
+    frame = pd.read_csv(path, dtype=dataset_dtypes(path))
+    if persist:
+        _write_sidecar(path, frame)
+    return frame
+
+
+def read_batches(path, batch_size, name=None):
+    """Yield typed frames of at most ``batch_size`` rows, never holding the whole file.
+
+    ``name`` selects the schema of another dataset, e.g. for a file of new
+    listings destined for ``Housing.csv``.
+    """
+    with pd.read_csv(path, dtype=dataset_dtypes(path, name), chunksize=batch_size) as reader:
+        yield from reader
+
+
+datasets = FileCache(read_dataset)
+
+
+def load_dataset(path):
+    """Return the shared, typed frame for ``path``."""
+    return datasets.get(path)
+
+
+def dataset_version(path):
+    return datasets.version(path)
@@ -0,0 +1,230 @@
+"""Feature preparation shared by the Streamlit apps and the inference server."""
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from common.batch import feature_matrix
+from common.inference import NotCompilable, fast_predict
+
+# Raw property inputs collected by the task3 sidebar, in sidebar order
+HOUSE_INPUT_COLUMNS = (
+    'Area', 'Location', 'No. of Bedrooms', 'Bathrooms', 'CarParking',
+    'Age_of_Property', 'Furnishing_Status',
+)
+HOUSE_CATEGORICAL = ['Location', 'Furnishing_Status']
+
+
+def as_columns(rows):
+    """Normalize a DataFrame, a single record or a list of records to column arrays."""
+    if isinstance(rows, pd.DataFrame):
+        return {column: rows[column].to_numpy() for column in rows.columns}, len(rows)
+    if isinstance(rows, dict):
+        return {column: np.asarray([value]) for column, value in rows.items()}, 1
+    rows = list(rows)
+    columns = {}
+    for row in rows:
+        for column in row:
+            columns.setdefault(column, None)
+    return {column: np.asarray([row.get(column) for row in rows]) for column in columns}, len(rows)
+
+
+def _is_missing(values):
+    if values.dtype.kind in "fc":
+        return np.isnan(values)
+    return pd.isna(values)
+
+
+class HouseFeatureEncoder:
+    """Precompiled encoder from raw task3 inputs to the model's feature space.
+
+    Built once per model from ``feature_names_in_``.  For the shipped pipeline
+    (``ColumnTransformer`` of imputer+scaler and imputer+one-hot) the
+    preprocessing itself is compiled: numeric columns map to output slots with
+    their scaler constants, every category maps to a one-hot slot, and rows are
+    written straight into a preallocated NumPy matrix that goes to the final
+    estimator (itself compiled by ``common.inference`` where possible).  Other models fall back to a column-index map that assembles the
+    aligned frame in one allocation instead of inserting columns one by one.
+
+    Inputs the model was trained on but the caller does not supply are treated
+    as 0, matching what the app has always done for the amenity flags.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.feature_names = list(model.feature_names_in_)
+        try:
+            self._compile_pipeline(model)
+            self.compiled = True
+        except NotCompilable:
+            self._compile_index_map()
+            self.compiled = False
+
+    # -- compiled ColumnTransformer path ------------------------------------
+
+    def _compile_pipeline(self, model):
+        steps = getattr(model, "steps", None)
+        if not steps or len(steps) != 2:
+            raise NotCompilable("expected a (preprocessor, model) pipeline")
+        preprocessor, self._estimator = steps[0][1], steps[1][1]
+        if not hasattr(preprocessor, "transformers_"):
+            raise NotCompilable("preprocessor is not a fitted ColumnTransformer")
+
+        numeric = []        # (column, output slot, fill value, center, scale)
+        categorical = []    # (column, fill value, {category: output slot})
+        width = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "remainder":
+                if transformer != "drop" and len(columns):
+                    raise NotCompilable("remainder columns are passed through")
+                continue
+            chain = transformer.steps if hasattr(transformer, "steps") else [(name, transformer)]
+            kinds = [type(step).__name__ for _, step in chain]
+            columns = list(columns)
+            if kinds in (["SimpleImputer", "StandardScaler"], ["StandardScaler"]):
+                imputer = chain[0][1] if kinds[0] == "SimpleImputer" else None
+                scaler = chain[-1][1]
+                for i, column in enumerate(columns):
+                    fill = imputer.statistics_[i] if imputer is not None else np.nan
+                    center = scaler.mean_[i] if scaler.mean_ is not None else 0.0
+                    scale = scaler.scale_[i] if scaler.scale_ is not None else 1.0
+                    numeric.append((column, width, fill, center, scale))
+                    width += 1
+            elif kinds in (["SimpleImputer", "OneHotEncoder"], ["OneHotEncoder"]):
+                imputer = chain[0][1] if kinds[0] == "SimpleImputer" else None
+                encoder = chain[-1][1]
+                if encoder.drop_idx_ is not None or encoder.handle_unknown != "ignore":
+                    raise NotCompilable("only drop=None, handle_unknown='ignore' one-hot encoders")
+                for i, column in enumerate(columns):
+                    fill = imputer.statistics_[i] if imputer is not None else None
+                    slots = {category: width + k for k, category in enumerate(encoder.categories_[i])}
+                    categorical.append((column, fill, slots))
+                    width += len(slots)
+            else:
+                raise NotCompilable(f"unsupported transformer chain {kinds}")
+
+        self.width = width
+        self._numeric = numeric
+        self._categorical = categorical
+        self._numeric_slots = np.array([slot for _, slot, _, _, _ in numeric], dtype=np.intp)
+        self._center = np.array([center for _, _, _, center, _ in numeric])
+        self._scale = np.array([scale for _, _, _, _, scale in numeric])
+        # Template row for inputs the caller leaves out: raw 0, scaled
+        self._base = np.zeros(width)
+        self._base[self._numeric_slots] = (0.0 - self._center) / self._scale
+        self._check_parity()
+
+    def _check_parity(self):
+        # Guard against transformer options the compiler does not model: the
+        # compiled path must agree with the pipeline on a couple of probe rows.
+        probe = {name: [0.0, 0.0] for name in self.feature_names}
+        probe.update({column: [1.0, 2.0] for column, *_ in self._numeric})
+        for column, _, slots in self._categorical:
+            categories = list(slots)
+            probe[column] = [categories[0], categories[-1]]
+        frame = pd.DataFrame(probe)[self.feature_names]
+        expected = self.model.predict(frame)
+        actual = self._estimator.predict(self._transform_compiled(*as_columns(frame)))
+        if not np.allclose(expected, actual, rtol=1e-6, atol=1e-6):
+            raise NotCompilable("compiled transform does not match the pipeline")
+
+    def _transform_compiled(self, columns, n_rows):
+        matrix = np.tile(self._base, (n_rows, 1))
+        for column, slot, fill, center, scale in self._numeric:
+            values = columns.get(column)
+            if values is None:
+                continue
+            values = values.astype(np.float64)
+            if not np.isnan(fill):
+                values = np.where(np.isnan(values), fill, values)
+            matrix[:, slot] = (values - center) / scale
+        for column, fill, slots in self._categorical:
+            values = columns.get(column)
+            if values is None:
+                continue
+            if fill is not None:
+                values = np.where(_is_missing(values), fill, values)
+            index = np.fromiter((slots.get(value, -1) for value in values), dtype=np.intp, count=n_rows)
+            hit = np.nonzero(index >= 0)[0]
+            matrix[hit, index[hit]] = 1.0
+        return matrix
+
+    # -- generic index-map path ---------------------------------------------
+
+    def _compile_index_map(self):
+        self._slots = {name: i for i, name in enumerate(self.feature_names)}
+        # get_dummies-style names such as "Location_Gachibowli"
+        self._dummies = {column: {} for column in HOUSE_CATEGORICAL}
+        for name, i in self._slots.items():
+            for column in HOUSE_CATEGORICAL:
+                prefix = column + "_"
+                if name.startswith(prefix):
+                    self._dummies[column][name[len(prefix):]] = i
+
+    def _transform_index_map(self, columns, n_rows):
+        data = {name: np.zeros(n_rows) for name in self.feature_names}
+        for column, values in columns.items():
+            if column in self._slots:
+                data[column] = values
+            elif self._dummies.get(column):
+                for category, i in self._dummies[column].items():
+                    data[self.feature_names[i]] = (values == category).astype(np.float64)
+        return pd.DataFrame(data, columns=self.feature_names)
+
+    # -- public API -----------------------------------------------------------
+
+    def transform(self, rows):
+        """Encode ``rows`` (DataFrame, record dict or list of records)."""
+        return self.transform_columns(*as_columns(rows))
+
+    def transform_columns(self, columns, n_rows):
+        """Encode ``{column: array of n_rows values}``, e.g. a generated grid, without a DataFrame."""
+        if self.compiled:
+            return self._transform_compiled(columns, n_rows)
+        return self._transform_index_map(columns, n_rows)
+
+    def predict(self, rows):
+        return self.predict_columns(*as_columns(rows))
+
+    def predict_columns(self, columns, n_rows):
+        encoded = self.transform_columns(columns, n_rows)
+        if self.compiled:
+            return fast_predict(self._estimator, encoded)
+        return self.model.predict(encoded)
+
+
+_encoders = weakref.WeakKeyDictionary()
+
+
+def get_house_encoder(model_pipeline):
+    """Return the encoder for ``model_pipeline``, building it on first use."""
+    encoder = _encoders.get(model_pipeline)
+    if encoder is None:
+        encoder = _encoders[model_pipeline] = HouseFeatureEncoder(model_pipeline)
+    return encoder
+
+
+def predict_house_prices(model_pipeline, rows):
+    return get_house_encoder(model_pipeline).predict(rows)
+
+
+def prepare_tabular(model, rows):
+    """Numeric feature matrix for the task1/task2 models.
+
+    ``rows`` is a DataFrame, a list of records, or a list of value lists; the
+    last go straight to NumPy without building a DataFrame.
+    """
+    if isinstance(rows, pd.DataFrame):
+        return feature_matrix(model, rows)
+    if len(rows) and isinstance(rows[0], dict):
+        return feature_matrix(model, pd.DataFrame.from_records(rows))
+    X = np.asarray(rows, dtype=np.float64)
+    n_features = getattr(model, "n_features_in_", None)
+    if X.ndim == 2 and n_features is not None and X.shape[1] > n_features:
+        X = X[:, :n_features]
+    return X
+
+
+def predict_tabular(model, rows):
+    # Saved pipelines scale (and stack) raw inputs inside the compiled predict
+    return fast_predict(model, prepare_tabular(model, rows))
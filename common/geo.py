@@ -0,0 +1,110 @@
+"""Location coordinates and pre-aggregated heatmap points for task3.
+
+``Hyderabad.csv`` only has a ``Location`` name per listing.  Coordinates come
+from a local lookup table (``common/data/hyderabad_locations.csv``, no network
+access needed) joined on the normalized locality name.  Points are then binned
+onto a grid server-side, so the folium payload grows with the number of
+occupied cells rather than the number of listings.
+"""
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.cache import DerivedCache, FileCache
+from common.datasets import dataset_version, load_dataset
+
+LOCATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hyderabad_locations.csv")
+HYDERABAD_CENTER = (17.3850, 78.4867)
+# Grid cell edge in degrees; ~0.005 deg is roughly 550 m at Hyderabad's latitude
+DEFAULT_CELL = 0.005
+
+
+def normalize_location(name):
+    return " ".join(str(name).lower().split())
+
+
+def _read_locations(path):
+    table = pd.read_csv(path)
+    keys = table["Location"].map(normalize_location)
+    return dict(zip(keys, zip(table["Latitude"].astype(float), table["Longitude"].astype(float))))
+
+
+_locations = FileCache(_read_locations)
+
+
+def coordinates(locations, path=LOCATIONS_PATH):
+    """Return latitude/longitude arrays for a Series of location names.
+
+    Each distinct name is looked up once; unknown names get NaN.
+    """
+    lookup = _locations.get(path)
+    codes, uniques = pd.factorize(locations)
+    missing = (np.nan, np.nan)
+    table = np.array(
+        [lookup.get(normalize_location(name), missing) for name in uniques], dtype=np.float64
+    ).reshape(-1, 2)
+    # Code -1 (missing name) picks the trailing NaN row
+    table = np.vstack([table, [np.nan, np.nan]])
+    picked = table[codes]
+    return picked[:, 0], picked[:, 1]
+
+
+def bin_points(latitude, longitude, weight, cell=DEFAULT_CELL):
+    """Aggregate points onto a ``cell``-degree grid.
+
+    Returns per-cell centroid latitude/longitude, summed weight and point count.
+    """
+    ok = ~(np.isnan(latitude) | np.isnan(longitude) | np.isnan(weight))
+    latitude, longitude, weight = latitude[ok], longitude[ok], weight[ok]
+    if len(latitude) == 0:
+        empty = np.empty(0)
+        return empty, empty, empty, np.empty(0, dtype=np.int64)
+    # Fold (row, column) grid indices into one int64 key so a 1-D unique suffices
+    rows = np.floor(latitude / cell).astype(np.int64)
+    cols = np.floor(longitude / cell).astype(np.int64)
+    rows -= rows.min()
+    cols -= cols.min()
+    _, inverse = np.unique(rows * (cols.max() + 1) + cols, return_inverse=True)
+    counts = np.bincount(inverse)
+    centroid_lat = np.bincount(inverse, weights=latitude) / counts
+    centroid_lon = np.bincount(inverse, weights=longitude) / counts
+    totals = np.bincount(inverse, weights=weight)
+    return centroid_lat, centroid_lon, totals, counts
+
+
+@dataclass
+class HeatmapData:
+    points: list
+    located: int
+    total: int
+
+
+def build_heatmap_data(dataset, weight_column="Price", cell=DEFAULT_CELL, locations_path=LOCATIONS_PATH):
+    if "Latitude" in dataset.columns and "Longitude" in dataset.columns:
+        latitude = dataset["Latitude"].to_numpy(dtype=np.float64)
+        longitude = dataset["Longitude"].to_numpy(dtype=np.float64)
+    else:
+        latitude, longitude = coordinates(dataset["Location"], locations_path)
+    weight = dataset[weight_column].to_numpy(dtype=np.float64)
+    lat, lon, totals, counts = bin_points(latitude, longitude, weight, cell)
+    # HeatMap intensities are relative; scale so the heaviest cell is 1
+    intensity = totals / totals.max() if len(totals) else totals
+    return HeatmapData(
+        points=np.column_stack([lat, lon, intensity]).tolist(),
+        located=int(counts.sum()),
+        total=len(dataset),
+    )
+
+
+_heatmaps = DerivedCache()
+
+
+def heatmap_data(csv_path, weight_column="Price", cell=DEFAULT_CELL, locations_path=LOCATIONS_PATH):
+    """Heatmap points for ``csv_path``, rebuilt only when the data or lookup table changes."""
+    key = (os.path.abspath(csv_path), weight_column, cell)
+    version = (dataset_version(csv_path), _locations.version(locations_path))
+    return _heatmaps.get(key, version, lambda: build_heatmap_data(
+        load_dataset(csv_path), weight_column, cell, locations_path
+    ))
@@ -0,0 +1,131 @@
+"""The listings datasets task3 can serve, each with its own schema and model.
+
+Every entry names its CSV and model pickle (both under ``task3/``), the
+target column, the raw inputs the model takes and the columns behind its
+charts.  Typed parsing comes from ``common.datasets.SCHEMAS``, predictions
+from the compiled encoder in ``common.features`` and chart summaries from
+``common.analytics``, each cached per dataset version.  ``neighbours``,
+``flags`` and ``partition`` say which listings count as comparable to a
+property (``common.comparables``), ``what_if`` which inputs its price curves
+are drawn across (``common.whatif``).
+
+The models of the non-Hyderabad datasets are grown batch by batch with
+``python -m training.incremental``.
+"""
+import os
+from dataclasses import dataclass, field
+
+from common.analytics import AMENITIES, HYDERABAD_CHARTS, ChartColumns
+from common.features import HOUSE_CATEGORICAL, HOUSE_INPUT_COLUMNS
+
+TASK3_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "task3")
+
+
+@dataclass(frozen=True)
+class HousingDataset:
+    key: str
+    label: str
+    csv: str
+    model: str
+    target: str
+    # Raw inputs collected from the user, in sidebar order
+    inputs: tuple
+    categorical: tuple = ()
+    charts: ChartColumns = field(default_factory=ChartColumns)
+    # Where the listings are, for the page copy
+    region: str = ""
+    # Symbol the prices are in; empty when the dataset does not say
+    currency: str = ""
+    # Listings can be placed on the Hyderabad locality heatmap (common.geo)
+    heatmap: bool = False
+    # Comparable listings: standardized numeric columns, yes/1 amenity flags,
+    # and the column they must share with the property when enough do
+    neighbours: tuple = ()
+    flags: tuple = ()
+    partition: str = ""
+    # Inputs the what-if curves are drawn across (common.whatif): one curve
+    # per level of the last, a heatmap over the first
+    what_if: tuple = ()
+
+    @property
+    def csv_path(self):
+        return os.path.join(TASK3_DIR, self.csv)
+
+    @property
+    def model_path(self):
+        return os.path.join(TASK3_DIR, self.model)
+
+    @property
+    def numeric(self):
+        return tuple(column for column in self.inputs if column not in self.categorical)
+
+
+HOUSING_DATASETS = {
+    "hyderabad": HousingDataset(
+        "hyderabad", "Hyderabad listings", "Hyderabad.csv", "house_price_model.pkl", "Price",
+        inputs=HOUSE_INPUT_COLUMNS, categorical=tuple(HOUSE_CATEGORICAL), charts=HYDERABAD_CHARTS,
+        region="Hyderabad", currency="₹", heatmap=True,
+        neighbours=("Area", "No. of Bedrooms"), flags=tuple(AMENITIES), partition="Location",
+        what_if=("No. of Bedrooms", "Location"),
+    ),
+    "india": HousingDataset(
+        "india", "House Price India", "House Price India.csv", "house_price_india_model.pkl", "Price",
+        inputs=(
+            "number of bedrooms", "number of bathrooms", "living area", "lot area", "number of floors",
+            "waterfront present", "number of views", "condition of the house", "grade of the house",
+            "Area of the basement", "Built Year", "Renovation Year", "Postal Code",
+            "Number of schools nearby", "Distance from the airport",
+        ),
+        categorical=("Postal Code",),
+        charts=ChartColumns(
+            value="Price", group="grade of the house", area="living area",
+            hover=("number of bedrooms", "Built Year"),
+            amenities=("waterfront present", "number of views"),
+        ),
+        region="India", currency="₹",
+        neighbours=("living area", "number of bedrooms", "number of bathrooms", "grade of the house",
+                    "number of views"),
+        flags=("waterfront present",), partition="Postal Code",
+        what_if=("number of bedrooms", "grade of the house"),
+    ),
+    "housing": HousingDataset(
+        "housing", "Housing", "Housing.csv", "housing_model.pkl", "price",
+        inputs=(
+            "area", "bedrooms", "bathrooms", "stories", "parking", "mainroad", "guestroom", "basement",
+            "hotwaterheating", "airconditioning", "prefarea", "furnishingstatus",
+        ),
+        categorical=(
+            "mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea",
+            "furnishingstatus",
+        ),
+        charts=ChartColumns(
+            value="price", group="furnishingstatus", area="area", hover=("bedrooms", "stories"),
+            amenities=("mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"),
+        ),
+        neighbours=("area", "bedrooms", "bathrooms", "stories", "parking"),
+        flags=("mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"),
+        partition="furnishingstatus",
+        what_if=("bedrooms", "furnishingstatus"),
+    ),
+    "listings": HousingDataset(
+        "listings", "House Price Prediction listings", "House Price Prediction final dataset.csv",
+        "house_listings_model.pkl", "price",
+        inputs=("beds", "baths", "size", "zip_code"),
+        categorical=("zip_code",),
+        charts=ChartColumns(value="price", group="zip_code", area="size", hover=("beds", "baths"), amenities=()),
+        # Seattle-area ZIP codes, priced in US dollars
+        currency="$",
+        neighbours=("size", "beds", "baths"), partition="zip_code", what_if=("beds", "zip_code"),
+    ),
+}
+
+
+def housing_dataset(key):
+    """The registered dataset ``key``; raises ``KeyError`` for unknown keys."""
+    return HOUSING_DATASETS[key]
+
+
+def dataset_for_csv(csv_path):
+    """The registered dataset whose CSV is named like ``csv_path``, or ``None``."""
+    name = os.path.basename(csv_path)
+    return next((spec for spec in HOUSING_DATASETS.values() if spec.csv == name), None)
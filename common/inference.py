@@ -0,0 +1,401 @@
+"""Compiled NumPy inference for the fitted tree ensembles and linear models.
+
+scikit-learn's ``predict`` validates its input, dispatches one job per tree
+through joblib and allocates per-tree outputs; for the single 4-feature rows
+the apps score that overhead is most of the ~10 ms a forest prediction takes.
+``compile_model`` extracts the fitted parameters once into flat arrays:
+
+* trees (random forests, single decision trees, squared-error gradient
+  boosting): every tree's nodes concatenated into ``left``/``right``/
+  ``feature``/``threshold``/``value`` tables, with leaves pointing at
+  themselves so all rows can walk all trees in lock-step for ``depth`` steps;
+* linear regressors: ``coef_`` and ``intercept_``, evaluated as one dot product;
+* pipelines saved by ``training.train`` (``StandardScaler`` and
+  ``AppendPrediction`` steps in front of one of the above): each step becomes a
+  NumPy expression, so raw inputs are scaled and scored in one fused call.
+
+Each compiled model is checked against ``model.predict`` on probe rows before
+it is used; anything unsupported or not bit-for-bit equivalent keeps using
+scikit-learn.  Beyond ``NATIVE_MIN_ROWS`` rows scikit-learn's multithreaded C
+traversal wins, so large batches are handed back to it.
+
+Check parity and latency for a pickle from the command line::
+
+    python -m common.inference task1/model.pkl task2/LR_model.pkl
+"""
+import sys
+import time
+import weakref
+
+import numpy as np
+
+# Batches at least this large go to scikit-learn's native predict
+NATIVE_MIN_ROWS = 512
+# Rows walked through the trees at a time, bounding the (rows, trees) index arrays
+TRAVERSAL_CHUNK = 4096
+TREE_ARRAYS = ("left", "right", "feature", "threshold", "value", "roots", "depth")
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def flatten_trees(trees):
+    """Concatenate fitted ``tree_`` objects into the flat node tables."""
+    tables = {name: [] for name in ("left", "right", "feature", "threshold", "value")}
+    roots, offset, depth = [], 0, 0
+    for tree in trees:
+        tree = tree.tree_
+        if tree.n_outputs != 1:
+            raise NotCompilable("multi-output trees are not supported")
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left == -1
+        tables["left"].append(np.where(leaf, nodes, tree.children_left) + offset)
+        tables["right"].append(np.where(leaf, nodes, tree.children_right) + offset)
+        tables["feature"].append(np.where(leaf, 0, tree.feature))
+        tables["threshold"].append(np.where(leaf, np.inf, tree.threshold))
+        tables["value"].append(tree.value[:, 0, :])
+        roots.append(offset)
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    arrays = {name: np.concatenate(parts) for name, parts in tables.items()}
+    arrays.update(roots=np.array(roots), depth=np.array([depth]))
+    return arrays
+
+
+class CompiledTrees:
+    """Lock-step traversal of every tree for a batch of rows."""
+
+    def __init__(self, arrays, n_features):
+        self.n_features = n_features
+        self.left = np.asarray(arrays["left"], dtype=np.intp)
+        self.right = np.asarray(arrays["right"], dtype=np.intp)
+        self.feature = np.asarray(arrays["feature"], dtype=np.intp)
+        self.threshold = np.asarray(arrays["threshold"], dtype=np.float64)
+        self.value = np.asarray(arrays["value"], dtype=np.float64)
+        self.roots = np.asarray(arrays["roots"], dtype=np.intp)
+        self.depth = int(arrays["depth"][0])
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in TREE_ARRAYS}
+
+    def leaves(self, X):
+        """``(rows, trees)`` leaf index of each row in each tree."""
+        # Trees compare float32 features against float64 thresholds, as scikit-learn does
+        X = X.astype(np.float32)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def leaf_values(self, X):
+        """``(rows, trees, k)`` leaf values, walked ``TRAVERSAL_CHUNK`` rows at a time."""
+        if len(X) <= TRAVERSAL_CHUNK:
+            return self.value[self.leaves(X)]
+        return np.concatenate([
+            self.value[self.leaves(X[start:start + TRAVERSAL_CHUNK])]
+            for start in range(0, len(X), TRAVERSAL_CHUNK)
+        ])
+
+
+class CompiledModel:
+    """A compiled stand-in for ``model.predict``."""
+
+    kind = None
+
+    def __init__(self, model, n_features):
+        self.model = model
+        self.n_features = n_features
+
+    def check_input(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[-1] if X.ndim else 0} features, but the model expects {self.n_features}."
+            )
+        if not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity.")
+        return X
+
+    def predict(self, X):
+        X = self.check_input(X)
+        if len(X) >= NATIVE_MIN_ROWS:
+            return self.model.predict(X)
+        return self._predict(X)
+
+    def arrays(self):
+        return {}
+
+
+class ForestClassifier(CompiledModel):
+    kind = "forest_classifier"
+
+    def __init__(self, model, trees):
+        super().__init__(model, model.n_features_in_)
+        self.trees = trees
+        # Leaf class weights -> per-tree probabilities, as DecisionTreeClassifier.predict_proba does
+        totals = trees.value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        self.proba = trees.value / totals
+        self.classes = model.classes_
+
+    def predict_proba(self, X):
+        return self.proba[self.trees.leaves(self.check_input(X))].mean(axis=1)
+
+    def _predict(self, X):
+        proba = self.proba[self.trees.leaves(X)].mean(axis=1)
+        return self.classes.take(proba.argmax(axis=1))
+
+    def arrays(self):
+        return self.trees.arrays()
+
+
+class ForestRegressor(CompiledModel):
+    kind = "forest_regressor"
+
+    def __init__(self, model, trees):
+        super().__init__(model, model.n_features_in_)
+        self.trees = trees
+
+    def _predict(self, X):
+        return self.trees.leaf_values(X)[:, :, 0].mean(axis=1)
+
+    def arrays(self):
+        return self.trees.arrays()
+
+
+class GradientBoostingRegressor(CompiledModel):
+    kind = "gradient_boosting_regressor"
+
+    def __init__(self, model, trees):
+        super().__init__(model, model.n_features_in_)
+        self.trees = trees
+        self.learning_rate = model.learning_rate
+        if model.init_ == "zero":
+            self.init = 0.0
+        elif hasattr(model.init_, "constant_"):
+            self.init = float(np.ravel(model.init_.constant_)[0])
+        else:
+            raise NotCompilable("only constant (DummyRegressor) or zero init is supported")
+
+    def _predict(self, X):
+        return self.init + self.learning_rate * self.trees.leaf_values(X)[:, :, 0].sum(axis=1)
+
+    def arrays(self):
+        return self.trees.arrays()
+
+
+class LinearRegressor(CompiledModel):
+    kind = "linear_regressor"
+
+    def __init__(self, model):
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.ndim == 2 and coef.shape[0] != 1:
+            raise NotCompilable("multi-output linear models are not supported")
+        super().__init__(model, coef.size)
+        self.coef = coef.ravel()
+        self.intercept = float(np.ravel(model.intercept_)[0]) if np.ndim(model.intercept_) else float(model.intercept_)
+
+    def _predict(self, X):
+        return X @ self.coef + self.intercept
+
+    def predict(self, X):
+        # A dot product stays cheaper than scikit-learn's validation at any size
+        return self._predict(self.check_input(X))
+
+
+class ScalerStep:
+    """A fitted ``StandardScaler``: ``(X - mean) / scale``."""
+
+    def __init__(self, scaler):
+        n_features = scaler.n_features_in_
+        self.n_features = n_features
+        # StandardScaler fits mean_ even with with_mean=False; only the flags decide what is applied
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n_features)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n_features)
+
+    def transform(self, X):
+        return (X - self.mean) / self.scale
+
+    def inverse(self, X):
+        return X * self.scale + self.mean
+
+
+class AppendPredictionStep:
+    """``common.transformers.AppendPrediction`` with its estimator compiled."""
+
+    def __init__(self, step):
+        self.estimator = _build(step.estimator_)
+        self.n_features = self.estimator.n_features
+
+    def transform(self, X):
+        return np.column_stack([X, self.estimator._predict(X)])
+
+    def inverse(self, X):
+        return X[:, :-1]
+
+
+class CompiledPipeline(CompiledModel):
+    """Preprocessing steps and the final estimator, fused into one NumPy call."""
+
+    def __init__(self, model, steps, final):
+        super().__init__(model, steps[0].n_features if steps else final.n_features)
+        self.steps = steps
+        self.final = final
+        self.kind = f"{final.kind} pipeline"
+
+    def transform(self, X):
+        for step in self.steps:
+            X = step.transform(X)
+        return X
+
+    def inverse(self, X):
+        for step in reversed(self.steps):
+            X = step.inverse(X)
+        return X
+
+    def _predict(self, X):
+        return self.final._predict(self.transform(X))
+
+    def arrays(self):
+        return self.final.arrays()
+
+
+def _build_step(step):
+    name = type(step).__name__
+    if name == "StandardScaler":
+        return ScalerStep(step)
+    if name == "AppendPrediction":
+        return AppendPredictionStep(step)
+    raise NotCompilable(f"no compiled path for pipeline step {name}")
+
+
+def _build(model, arrays=None):
+    name = type(model).__name__
+    if name == "Pipeline":
+        steps = [_build_step(step) for _, step in model.steps[:-1] if step not in (None, "passthrough")]
+        return CompiledPipeline(model, steps, _build(model.steps[-1][1], arrays))
+    if name in ("RandomForestClassifier", "ExtraTreesClassifier", "DecisionTreeClassifier", "ExtraTreeClassifier"):
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise NotCompilable("multi-output classifiers are not supported")
+        trees = getattr(model, "estimators_", [model])
+        return ForestClassifier(model, CompiledTrees(arrays or flatten_trees(trees), model.n_features_in_))
+    if name in ("RandomForestRegressor", "ExtraTreesRegressor", "DecisionTreeRegressor", "ExtraTreeRegressor"):
+        trees = getattr(model, "estimators_", [model])
+        return ForestRegressor(model, CompiledTrees(arrays or flatten_trees(trees), model.n_features_in_))
+    if name == "GradientBoostingRegressor":
+        return GradientBoostingRegressor(
+            model, CompiledTrees(arrays or flatten_trees(model.estimators_[:, 0]), model.n_features_in_)
+        )
+    if name in ("LinearRegression", "Ridge", "Lasso", "ElasticNet", "LassoLars", "Lars", "BayesianRidge", "HuberRegressor"):
+        return LinearRegressor(model)
+    raise NotCompilable(f"no compiled path for {name}")
+
+
+def probe_rows(compiled, n_rows=256, seed=0):
+    """Rows spread over the range each feature is split on (or around 0 for linear models)."""
+    if isinstance(compiled, CompiledPipeline):
+        # Probe the final estimator's input space, mapped back to raw inputs
+        return compiled.inverse(probe_rows(compiled.final, n_rows, seed))
+    rng = np.random.default_rng(seed)
+    X = rng.normal(scale=3.0, size=(n_rows, compiled.n_features))
+    trees = getattr(compiled, "trees", None)
+    if trees is not None:
+        split = trees.left != np.arange(len(trees.left))
+        for j in range(compiled.n_features):
+            thresholds = trees.threshold[split & (trees.feature == j)]
+            if len(thresholds):
+                low, high = thresholds.min(), thresholds.max()
+                margin = max(high - low, 1.0) * 0.1
+                X[:, j] = rng.uniform(low - margin, high + margin, size=n_rows)
+    return X
+
+
+def check_parity(compiled, X=None):
+    """Raise ``NotCompilable`` unless ``compiled`` agrees with ``model.predict`` on ``X``."""
+    X = probe_rows(compiled) if X is None else compiled.check_input(X)
+    expected = compiled.model.predict(X)
+    actual = compiled._predict(X)
+    if expected.dtype.kind in "fc":
+        same = np.allclose(actual, expected, rtol=1e-9, atol=1e-9)
+    else:
+        same = np.array_equal(actual, expected)
+    if not same:
+        raise NotCompilable(f"compiled {compiled.kind} does not match {type(compiled.model).__name__}.predict")
+
+
+def compile_model(model, arrays=None):
+    """Compile ``model`` (optionally from previously exported node ``arrays``) and verify it."""
+    compiled = _build(model, arrays)
+    check_parity(compiled)
+    return compiled
+
+
+_compiled = weakref.WeakKeyDictionary()
+
+
+def get_compiled(model):
+    """The compiled form of ``model``, or ``None`` when it has to stay on scikit-learn."""
+    try:
+        compiled = _compiled.get(model)
+    except TypeError:
+        return None
+    if compiled is None:
+        try:
+            compiled = compile_model(model)
+        except (NotCompilable, AttributeError, ValueError):
+            compiled = False
+        _compiled[model] = compiled
+    return compiled or None
+
+
+def attach_arrays(model, arrays):
+    """Compile ``model`` from exported (e.g. memory-mapped) node arrays."""
+    try:
+        _compiled[model] = compile_model(model, arrays)
+    except (NotCompilable, KeyError, TypeError, ValueError):
+        pass
+
+
+def fast_predict(model, X):
+    """``model.predict(X)``, through the compiled path when there is one."""
+    compiled = get_compiled(model)
+    if compiled is None:
+        return model.predict(X)
+    return compiled.predict(X)
+
+
+def main(argv=None):
+    import joblib
+
+    paths = sys.argv[1:] if argv is None else argv
+    failed = 0
+    for path in paths:
+        model = joblib.load(path)
+        try:
+            compiled = compile_model(model)
+        except NotCompilable as exc:
+            print(f"{path}: not compiled ({exc})")
+            failed += 1
+            continue
+        X = probe_rows(compiled, n_rows=NATIVE_MIN_ROWS - 1, seed=1)
+        check_parity(compiled, X)
+        row = X[:1]
+        timings = []
+        for fn in (model.predict, compiled.predict):
+            fn(row)
+            start = time.perf_counter()
+            for _ in range(50):
+                fn(row)
+            timings.append((time.perf_counter() - start) / 50)
+        print(f"{path}: {compiled.kind}, parity ok on {len(X) + 256} rows; single row "
+              f"{timings[0] * 1e3:.3f} ms -> {timings[1] * 1e3:.3f} ms ({timings[0] / timings[1]:.0f}x)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
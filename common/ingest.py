@@ -0,0 +1,120 @@
+"""Single-pass, chunked ingestion of uploaded CSV files.
+
+``st.file_uploader`` hands us a binary buffer.  Instead of decoding the whole
+upload into a ``str`` and parsing it (twice) from a ``StringIO``, the buffer is
+parsed directly in chunks; each chunk is scored, folded into running column
+statistics and appended to the scored CSV offered for download, then dropped.
+Only a bounded preview of the rows is kept in memory; the scored CSV spills
+to a temporary file once it outgrows ``SPOOL_MAX_BYTES``.
+
+Column types are inferred from the first chunk and then fixed for the rest of
+the file, so a later chunk can never gain or lose a numeric column (and shift
+the model's features); a value that does not fit raises ``ValueError``.
+"""
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.batch import feature_matrix, predict_batch
+from common.stats import RunningStats
+
+DEFAULT_CHUNK_SIZE = 50_000
+PREDICTION_COLUMN = "Prediction"
+# Scored output kept in memory before it moves to a temporary file
+SPOOL_MAX_BYTES = 8 * 2**20
+
+
+@dataclass
+class IngestResult:
+    preview: pd.DataFrame
+    stats: RunningStats
+    rows: int = 0
+    predict_seconds: float = 0.0
+    # Spooled file holding the scored CSV, when a model was given
+    scored_file: object = None
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.predict_seconds if self.predict_seconds > 0 else float("inf")
+
+    def scored_csv(self):
+        """The scored CSV as bytes; pass the method itself to ``st.download_button`` to read it only on click."""
+        if self.scored_file is None:
+            return b""
+        self.scored_file.seek(0)
+        return self.scored_file.read()
+
+
+def csv_dtypes(frame):
+    """Column types to read every chunk with, taken from the first chunk ``frame``."""
+    # Numbers are read as float64, so a blank cell in a later chunk is NaN rather than a new type
+    return {
+        column: np.float64 if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        else dtype
+        for column, dtype in frame.dtypes.items()
+    }
+
+
+def iter_csv_chunks(buffer, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames parsed straight from a seekable binary buffer, all typed like the first chunk."""
+    buffer.seek(0)
+    first = pd.read_csv(buffer, nrows=chunk_size)
+    buffer.seek(0)
+    rows = 0
+    with pd.read_csv(buffer, chunksize=chunk_size, dtype=csv_dtypes(first)) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except ValueError as exc:
+                raise ValueError(
+                    f"Rows {rows + 1:,}-{rows + chunk_size:,} do not match the column types of the first "
+                    f"{len(first):,} rows: {exc}"
+                ) from exc
+            rows += len(chunk)
+            yield chunk
+
+
+def ingest_csv(buffer, model=None, chunk_size=DEFAULT_CHUNK_SIZE, preview_rows=1000):
+    """Parse ``buffer`` once, scoring and summarizing it chunk by chunk."""
+    preview = []
+    preview_len = 0
+    stats = None
+    numeric = None
+    rows = 0
+    predict_seconds = 0.0
+    scored_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) if model is not None else None
+
+    for chunk in iter_csv_chunks(buffer, chunk_size):
+        if stats is None:
+            # Fixed by the first chunk; iter_csv_chunks keeps every later chunk to the same types
+            numeric = list(chunk.select_dtypes(include="number").columns)
+            stats = RunningStats(numeric)
+        stats.update(chunk)
+
+        if model is not None:
+            features = feature_matrix(model, chunk[numeric])
+            start = time.perf_counter()
+            chunk[PREDICTION_COLUMN] = predict_batch(model, features, chunk_size)
+            predict_seconds += time.perf_counter() - start
+            chunk.to_csv(scored_file, header=rows == 0, index=False)
+
+        if preview_len < preview_rows:
+            head = chunk.head(preview_rows - preview_len)
+            preview.append(head)
+            preview_len += len(head)
+        rows += len(chunk)
+
+    if stats is None:
+        raise ValueError("The uploaded file contains no rows.")
+    return IngestResult(
+        preview=pd.concat(preview, ignore_index=True),
+        stats=stats,
+        rows=rows,
+        predict_seconds=predict_seconds,
+        scored_file=scored_file,
+    )
@@ -0,0 +1,109 @@
+"""Process-wide model registry shared by the Streamlit apps.
+
+A model is deserialized once per process and reused by every rerun and every
+session, instead of once per rerun.  See ``common.cache`` for how entries are
+invalidated when the pickle on disk changes.
+
+When a verified artifact exported by ``common.artifacts`` sits next to the
+pickle (``model.pkl`` -> ``model.artifact/``) it is loaded instead, with its
+arrays memory-mapped so worker processes share them.  Stale or corrupt
+artifacts are logged and ignored in favour of the pickle.
+
+Models installed by ``training.train`` have their training metrics beside the
+pickle (``model.pkl`` -> ``model.metrics.json``); see ``model_metrics``.
+"""
+import json
+import logging
+import os
+
+from common.artifacts import MANIFEST, ArtifactError, artifact_path, load_artifact
+from common.cache import FileCache, file_signature
+
+logger = logging.getLogger(__name__)
+
+
+def _joblib_load(path):
+    artifact = artifact_path(path)
+    if os.path.isdir(artifact):
+        try:
+            loaded = load_artifact(artifact, source=path)
+            if loaded.arrays:
+                # Compiled inference reads the shared, memory-mapped node tables
+                from common.inference import attach_arrays
+                attach_arrays(loaded.model, loaded.arrays)
+            return loaded.model
+        except ArtifactError as exc:
+            logger.warning("Not using model artifact: %s", exc)
+    # Imported on first load so importing the registry stays cheap
+    import joblib
+    return joblib.load(path)
+
+
+class ModelRegistry(FileCache):
+    """Cache of loaded models keyed by absolute path."""
+
+    def __init__(self, loader=_joblib_load):
+        super().__init__(loader)
+
+    def signature(self, path):
+        # Re-exporting the artifact reloads the model too
+        manifest = os.path.join(artifact_path(path), MANIFEST)
+        if os.path.exists(manifest):
+            return file_signature(path) + file_signature(manifest)
+        return file_signature(path)
+
+
+registry = ModelRegistry()
+
+
+def load_model(path):
+    """Load ``path`` through the shared registry."""
+    return registry.get(path)
+
+
+def model_version(path):
+    return registry.version(path)
+
+
+def metrics_path(path):
+    """``dir/model.pkl`` -> ``dir/model.metrics.json``."""
+    return os.path.splitext(os.path.abspath(path))[0] + ".metrics.json"
+
+
+def _read_metrics(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_metrics = FileCache(_read_metrics)
+
+
+def model_metrics(path):
+    """Training metrics installed with the model at ``path``, or ``None``."""
+    sidecar = metrics_path(path)
+    if not os.path.exists(sidecar):
+        return None
+    try:
+        return _metrics.get(sidecar)
+    except (OSError, ValueError):
+        return None
+
+
+def describe_model(path):
+    """One-line summary of the installed model's version and scores, or ``None``."""
+    metrics = model_metrics(path)
+    if not metrics:
+        return None
+    parts = [f"{metrics.get('model_class', 'Model')} {metrics.get('version', '')}"]
+    cv = metrics.get("cv")
+    if cv:
+        parts.append(f"CV {cv.get('scoring', 'score')} {cv.get('best_score', float('nan')):.3f}")
+    # Incrementally trained models are scored on each batch before it is folded in
+    incremental = metrics.get("incremental")
+    if incremental:
+        batches = incremental["batches"]
+        parts.append(f"{incremental['rows']:,} rows in {batches} batch{'' if batches == 1 else 'es'}")
+    holdout = ", ".join(f"{key} {value:.3f}" for key, value in metrics.get("holdout", {}).items())
+    if holdout:
+        parts.append(f"{'last batch' if incremental else 'holdout'} {holdout}")
+    return " · ".join(parts)
@@ -0,0 +1,86 @@
+"""Cached rendering of the 6-panel feature grid shown by task1/task2.
+
+The grid is drawn with matplotlib's object-oriented API (no ``pyplot``), so the
+figure never enters pyplot's global registry and is freed as soon as it has
+been rasterized.  PNGs are kept in a small LRU keyed by what the grid actually
+depends on: the column names, the first row's values and the plot colour.
+Reruns triggered by unrelated widgets therefore skip rendering entirely, and
+matplotlib itself is only imported the first time a grid is actually drawn.
+"""
+import hashlib
+from io import BytesIO
+
+from common.cache import LRUCache
+from common.telemetry import metrics
+
+DEFAULT_DPI = 100
+
+render_cache = LRUCache(max_entries=64)
+metrics.track_cache("feature_grid", render_cache)
+
+
+def grid_key(df, plot_color):
+    row = df.iloc[0]
+    payload = repr((tuple(map(str, df.columns)), tuple(row.tolist()), plot_color))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def draw_feature_grid(df, plot_color):
+    """Build the 2x3 grid figure for the first row of ``df``."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(18, 10))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 3)
+
+    # Bar Chart
+    axes[0, 0].bar(df.columns, df.iloc[0], color=plot_color, edgecolor='black')
+    axes[0, 0].set_title("Bar Chart", fontsize=14)
+    axes[0, 0].set_xlabel("Features", fontsize=12)
+    axes[0, 0].set_ylabel("Values", fontsize=12)
+
+    # Line Plot
+    axes[0, 1].plot(df.columns, df.iloc[0], color=plot_color, marker='o', linestyle='-', linewidth=2, markersize=8)
+    axes[0, 1].set_title("Line Plot", fontsize=14)
+    axes[0, 1].set_xlabel("Features", fontsize=12)
+    axes[0, 1].set_ylabel("Values", fontsize=12)
+    axes[0, 1].grid(True)
+
+    # Scatter Plot
+    axes[0, 2].scatter(df.columns, df.iloc[0], color=plot_color, s=100, edgecolors='black')
+    axes[0, 2].set_title("Scatter Plot", fontsize=14)
+    axes[0, 2].set_xlabel("Features", fontsize=12)
+    axes[0, 2].set_ylabel("Values", fontsize=12)
+
+    # Histogram
+    axes[1, 0].hist(df.iloc[0], bins=5, color=plot_color, edgecolor='black')
+    axes[1, 0].set_title("Histogram", fontsize=14)
+    axes[1, 0].set_xlabel("Values", fontsize=12)
+    axes[1, 0].set_ylabel("Frequency", fontsize=12)
+
+    # Pie Chart
+    axes[1, 1].pie(df.iloc[0], labels=df.columns, autopct='%1.1f%%', colors=[plot_color] * len(df.columns), startangle=90)
+    axes[1, 1].set_title("Pie Chart", fontsize=14)
+
+    # Box Plot
+    axes[1, 2].boxplot(df.iloc[0], vert=False, patch_artist=True, boxprops=dict(facecolor=plot_color))
+    axes[1, 2].set_title("Box Plot", fontsize=14)
+    axes[1, 2].set_xlabel("Values", fontsize=12)
+
+    fig.tight_layout()
+    return fig
+
+
+def render_feature_grid(df, plot_color, dpi=DEFAULT_DPI):
+    """Return the grid for ``df`` as PNG bytes, rendering only on a cache miss."""
+    def render():
+        fig = draw_feature_grid(df, plot_color)
+        buf = BytesIO()
+        try:
+            fig.savefig(buf, format="png", dpi=dpi)
+        finally:
+            fig.clear()
+        return buf.getvalue()
+
+    return render_cache.get_or_build(grid_key(df, plot_color), render)
@@ -0,0 +1,57 @@
+"""Cross-session cache of single-row predictions.
+
+The sidebar inputs span a small space and users keep revisiting the same
+combinations, so a prediction is computed once per (model version, input row)
+and then served from a bounded, expiring LRU shared by every session in the
+process.  Rows are keyed on a canonical form: dict key order does not matter,
+numeric values are compared as floats (``3`` and ``3.0`` are the same input)
+and NumPy scalars are unwrapped.  Retraining a model changes its version, so
+stale predictions are never served.
+
+Hit/miss counts are exported with the other metrics in ``common.telemetry``.
+"""
+import hashlib
+import json
+import numbers
+
+import numpy as np
+
+from common.cache import LRUCache
+from common.models import model_version
+from common.telemetry import metrics
+
+MAX_ENTRIES = 10_000
+TTL_SECONDS = 6 * 60 * 60
+
+prediction_cache = LRUCache(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS)
+metrics.track_cache("predictions", prediction_cache)
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, numbers.Real):
+        return float(value)
+    return str(value)
+
+
+def row_key(row):
+    """Stable digest of ``row`` (a record dict or a sequence of feature values)."""
+    payload = json.dumps(_canonical(row), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cached_predict(model_path, row, predict):
+    """Return ``predict()`` for ``row``, reusing an earlier result for the same model version.
+
+    Results are shared between sessions and must not be mutated.  Errors
+    raised by ``predict`` propagate and nothing is cached.
+    """
+    key = (model_version(model_path), row_key(row))
+    return prediction_cache.get_or_build(key, predict)
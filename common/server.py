@@ -0,0 +1,190 @@
+"""Headless JSON/CSV inference service for the three task models.
+
+A dependency-free ASGI application, so it runs under any ASGI server::
+
+    uvicorn common.server:app --workers 2
+
+or, when uvicorn is installed, ``python -m common.server``.  Models are loaded
+once at startup through the shared registry and predictions run on a thread
+pool so concurrent requests do not block the event loop.
+
+Routes (``<name>`` is ``task1``, ``task2``, ``task3`` or ``task3-<dataset>`` for
+the other listings datasets in ``common.housing``)::
+
+    GET  /health
+    GET  /metrics               Prometheus text (see ``common.telemetry``)
+    POST /<name>/predict        {"features": [...]} or {"features": {...}}
+    POST /<name>/predict_batch  {"rows": [[...], ...]} / {"rows": [{...}, ...]}
+                                or a text/csv body with a header row
+"""
+import asyncio
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.features import HOUSE_INPUT_COLUMNS, predict_house_prices, predict_tabular
+from common.housing import HOUSING_DATASETS
+from common.models import load_model, model_version
+from common.telemetry import prometheus_text, span
+from common.warmup import ADVERTISING_MODEL, IRIS_MODEL
+
+
+@dataclass
+class ModelSpec:
+    path: str
+    predict: object
+    # Column names used when a row is sent as a plain list
+    columns: tuple = None
+
+
+MODELS = {
+    "task1": ModelSpec(IRIS_MODEL, predict_tabular),
+    "task2": ModelSpec(ADVERTISING_MODEL, predict_tabular),
+    "task3": ModelSpec(
+        HOUSING_DATASETS["hyderabad"].model_path,
+        predict_house_prices,
+        HOUSE_INPUT_COLUMNS,
+    ),
+}
+MODELS.update({
+    f"task3-{key}": ModelSpec(spec.model_path, predict_house_prices, spec.inputs)
+    for key, spec in HOUSING_DATASETS.items() if key != "hyderabad"
+})
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def parse_rows(rows, columns=None):
+    """JSON rows as the predict functions take them, without building a DataFrame.
+
+    Records pass through; plain lists become records over ``columns`` when the
+    model has named inputs, else a float matrix.
+    """
+    if not isinstance(rows, list) or not rows:
+        raise HTTPError(400, "Expected a non-empty list of rows.")
+    if isinstance(rows[0], dict):
+        return rows
+    if columns is not None:
+        return [dict(zip(columns, row)) for row in rows]
+    return np.asarray(rows, dtype=np.float64)
+
+
+class InferenceApp:
+    def __init__(self, models=None, max_workers=None):
+        self.models = dict(MODELS if models is None else models)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def preload(self):
+        for spec in self.models.values():
+            if os.path.exists(spec.path):
+                load_model(spec.path)
+
+    def predict(self, name, rows):
+        spec = self.models[name]
+        if not os.path.exists(spec.path):
+            raise HTTPError(503, f"Model file not found for {name}.")
+        with span(f"{name}.model.load", page="server"):
+            model = load_model(spec.path)
+        with span(f"{name}.predict", page="server"):
+            predictions = spec.predict(model, rows).tolist()
+        return predictions, model_version(spec.path)
+
+    async def handle(self, method, path, content_type, body):
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"]:
+            return 200, {"status": "ok", "models": sorted(self.models)}
+        if parts == ["metrics"]:
+            return 200, prometheus_text()
+        if len(parts) != 2 or parts[1] not in ("predict", "predict_batch"):
+            raise HTTPError(404, "Not found.")
+        name, action = parts
+        if name not in self.models:
+            raise HTTPError(404, f"Unknown model {name!r}.")
+        if method != "POST":
+            raise HTTPError(405, "Use POST.")
+
+        spec = self.models[name]
+        try:
+            if content_type.startswith("text/csv"):
+                rows = pd.read_csv(io.BytesIO(body))
+            else:
+                payload = json.loads(body or b"{}")
+                if action == "predict":
+                    features = payload.get("features")
+                    rows = [features] if features is not None else None
+                else:
+                    rows = payload.get("rows")
+                rows = parse_rows(rows, spec.columns)
+        except (ValueError, AttributeError, TypeError) as exc:
+            raise HTTPError(400, f"Could not parse request body: {exc}") from exc
+
+        loop = asyncio.get_running_loop()
+        try:
+            predictions, version = await loop.run_in_executor(self.executor, self.predict, name, rows)
+        except (ValueError, KeyError, TypeError) as exc:
+            raise HTTPError(400, f"Prediction failed: {exc}") from exc
+
+        if action == "predict":
+            return 200, {"model": name, "version": version, "prediction": predictions[0]}
+        return 200, {"model": name, "version": version, "predictions": predictions}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await asyncio.get_running_loop().run_in_executor(self.executor, self.preload)
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    self.executor.shutdown(wait=False)
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = dict(scope.get("headers") or [])
+        content_type = headers.get(b"content-type", b"application/json").decode("latin-1")
+
+        try:
+            status, payload = await self.handle(scope["method"], scope["path"], content_type, body)
+        except HTTPError as exc:
+            status, payload = exc.status, {"error": exc.message}
+
+        if isinstance(payload, str):
+            data, media_type = payload.encode("utf-8"), b"text/plain; version=0.0.4"
+        else:
+            data, media_type = json.dumps(payload).encode("utf-8"), b"application/json"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", media_type),
+                (b"content-length", str(len(data)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": data})
+
+
+app = InferenceApp()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("common.server:app", host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
@@ -0,0 +1,179 @@
+"""Single-pass column statistics for the "Perform Operations on Data" panel.
+
+All ten operations offered by the panel are derived from one accumulator:
+count, sum, min/max and the first four central moments, merged chunk by chunk
+so uploads can be summarized while they stream in.  The panel then looks the
+selected operation up in a precomputed table instead of running a separate
+pandas reduction per choice.
+"""
+import hashlib
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from common.cache import LRUCache
+from common.telemetry import metrics
+
+OPERATIONS = [
+    "Sum", "Max", "Min", "Mean", "Median", "Standard Deviation", "Variance", "Range", "Skewness", "Kurtosis"
+]
+
+
+class RunningStats:
+    """Column statistics accumulated chunk by chunk (Welford-style).
+
+    Moments are merged with the pairwise update of Chan et al. / Pébay, so the
+    results match pandas (``ddof=1`` variance, bias-corrected skewness and
+    excess kurtosis) without holding the data.  The median is an approximate
+    quantile taken from a uniform random sample of at most ``sample_size``
+    rows: exact for inputs up to that size, approximate beyond.
+    """
+
+    def __init__(self, columns, sample_size=100_000, seed=0):
+        self.columns = list(columns)
+        width = len(self.columns)
+        self._n = np.zeros(width)
+        self._total = np.zeros(width)
+        self._mean = np.zeros(width)
+        self._m2 = np.zeros(width)
+        self._m3 = np.zeros(width)
+        self._m4 = np.zeros(width)
+        self._minimum = np.full(width, np.nan)
+        self._maximum = np.full(width, np.nan)
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self._sample = np.empty((0, width))
+        self._sample_keys = np.empty(0)
+        self._table = None
+
+    @classmethod
+    def from_frame(cls, frame, **kwargs):
+        numeric = frame.select_dtypes(include="number")
+        stats = cls(numeric.columns, **kwargs)
+        stats.update(numeric)
+        return stats
+
+    def update(self, frame):
+        values = frame[self.columns].to_numpy(dtype=np.float64)
+        self._table = None
+        if len(values) == 0:
+            return
+        mask = ~np.isnan(values)
+        n_b = mask.sum(axis=0).astype(np.float64)
+        seen = n_b > 0
+        sum_b = np.nansum(values, axis=0)
+        mean_b = np.divide(sum_b, n_b, out=np.zeros_like(sum_b), where=seen)
+        centered = np.where(mask, values - mean_b, 0.0)
+        sq = centered * centered
+        m2_b = sq.sum(axis=0)
+        m3_b = (sq * centered).sum(axis=0)
+        m4_b = (sq * sq).sum(axis=0)
+
+        n_a = self._n
+        n = n_a + n_b
+        safe_n = np.where(n > 0, n, 1.0)
+        delta = mean_b - self._mean
+        delta2 = delta * delta
+        m4 = (self._m4 + m4_b
+              + delta2 * delta2 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b) / safe_n ** 3
+              + 6.0 * delta2 * (n_a * n_a * m2_b + n_b * n_b * self._m2) / safe_n ** 2
+              + 4.0 * delta * (n_a * m3_b - n_b * self._m3) / safe_n)
+        m3 = (self._m3 + m3_b
+              + delta2 * delta * n_a * n_b * (n_a - n_b) / safe_n ** 2
+              + 3.0 * delta * (n_a * m2_b - n_b * self._m2) / safe_n)
+        m2 = self._m2 + m2_b + delta2 * n_a * n_b / safe_n
+        self._mean = self._mean + delta * n_b / safe_n
+        self._m2, self._m3, self._m4 = m2, m3, m4
+        self._n = n
+        self._total = self._total + sum_b
+
+        with np.errstate(invalid="ignore"):
+            chunk_min = np.where(seen, np.nanmin(np.where(mask, values, np.inf), axis=0), np.nan)
+            chunk_max = np.where(seen, np.nanmax(np.where(mask, values, -np.inf), axis=0), np.nan)
+        self._minimum = np.fmin(self._minimum, chunk_min)
+        self._maximum = np.fmax(self._maximum, chunk_max)
+        self._update_sample(values)
+
+    def _update_sample(self, values):
+        # Keep the rows with the smallest random keys: a uniform sample that
+        # can be maintained with one argpartition per chunk.
+        keys = np.concatenate([self._sample_keys, self._rng.random(len(values))])
+        rows = np.concatenate([self._sample, values])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, rows = keys[keep], rows[keep]
+        self._sample_keys, self._sample = keys, rows
+
+    def _series(self, values):
+        return pd.Series(values, index=self.columns)
+
+    def sum(self):
+        return self._series(self._total)
+
+    def max(self):
+        return self._series(self._maximum)
+
+    def min(self):
+        return self._series(self._minimum)
+
+    def range(self):
+        return self._series(self._maximum - self._minimum)
+
+    def mean(self):
+        return self._series(np.where(self._n > 0, self._mean, np.nan))
+
+    def median(self):
+        if len(self._sample) == 0:
+            return self._series(np.full(len(self.columns), np.nan))
+        with warnings.catch_warnings():
+            # A column with no values has a NaN median, like pandas; nanmedian warns about it
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return self._series(np.nanmedian(self._sample, axis=0))
+
+    def var(self):
+        n = self._n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._series(np.where(n > 1, self._m2 / (n - 1), np.nan))
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def skew(self):
+        n = self._n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g1 = np.sqrt(n) * self._m3 / self._m2 ** 1.5
+            result = np.sqrt(n * (n - 1)) / (n - 2) * g1
+        result = np.where(self._m2 == 0, 0.0, result)
+        return self._series(np.where(n >= 3, result, np.nan))
+
+    def kurtosis(self):
+        n = self._n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            adj = 3.0 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            numer = n * (n + 1) * (n - 1) * self._m4
+            denom = (n - 2) * (n - 3) * self._m2 ** 2
+            result = numer / denom - adj
+        result = np.where(denom == 0, 0.0, result)
+        return self._series(np.where(n >= 4, result, np.nan))
+
+    def table(self):
+        """All panel operations for every column (rows: ``OPERATIONS``)."""
+        if self._table is None:
+            self._table = pd.DataFrame([
+                self.sum(), self.max(), self.min(), self.mean(), self.median(), self.std(),
+                self.var(), self.range(), self.skew(), self.kurtosis(),
+            ], index=OPERATIONS)
+        return self._table
+
+
+_tables = LRUCache(max_entries=256)
+metrics.track_cache("stats_tables", _tables)
+
+
+def frame_stats_table(df, key=None):
+    """Statistics table for an in-memory frame, cached by ``key`` (or content hash)."""
+    if key is None:
+        key = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+        key = (tuple(map(str, df.columns)), key)
+    return _tables.get_or_build(key, lambda: RunningStats.from_frame(df).table())
@@ -0,0 +1,321 @@
+"""Timing spans for the apps' hot paths.
+
+Each Streamlit rerun opens a ``Trace``; stages inside the script are wrapped in
+``span("name")`` (or decorated with ``@timed("name")``), which records wall
+time and the change in resident memory.  Finished traces are
+
+* folded into process-wide histograms, exported as Prometheus text by
+  ``prometheus_text()`` (served on ``GET /metrics`` by ``common.server``),
+* logged as one JSON line per rerun on the ``common.telemetry`` logger,
+* optionally shown in a sidebar panel, enabled with ``?debug=1`` in the page
+  URL or ``APP_DEBUG=1`` in the environment.
+
+Caches registered with ``metrics.track_cache`` export their hit/miss counts
+alongside the spans.
+
+Spans opened outside a trace (e.g. on server worker threads) still feed the
+histograms under the ``page`` they are given.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the exported latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes():
+    """Current resident set size, or ``None`` where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    seconds: float
+    rss_delta: int
+    depth: int
+
+
+class Metrics:
+    """Process-wide latency histograms per ``(page, span)``."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._series = {}
+        self._reruns = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def track_cache(self, name, cache):
+        """Export ``cache.stats()`` (an ``LRUCache``) under ``cache="name"``."""
+        with self._lock:
+            self._caches[name] = cache
+
+    def cache_stats(self):
+        with self._lock:
+            caches = dict(self._caches)
+        return {name: cache.stats() for name, cache in sorted(caches.items())}
+
+    def observe(self, page, name, seconds, rss_delta=None):
+        with self._lock:
+            series = self._series.get((page, name))
+            if series is None:
+                series = self._series[(page, name)] = {
+                    "buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0, "max": 0.0, "rss_sum": 0,
+                }
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["buckets"][i] += 1
+            series["count"] += 1
+            series["sum"] += seconds
+            series["max"] = max(series["max"], seconds)
+            if rss_delta is not None:
+                series["rss_sum"] += rss_delta
+
+    def rerun(self, page, seconds, rss_delta=None):
+        with self._lock:
+            rerun = self._reruns.get(page)
+            if rerun is None:
+                rerun = self._reruns[page] = {"count": 0, "sum": 0.0, "max": 0.0, "rss_sum": 0}
+            rerun["count"] += 1
+            rerun["sum"] += seconds
+            rerun["max"] = max(rerun["max"], seconds)
+            if rss_delta is not None:
+                rerun["rss_sum"] += rss_delta
+
+    def snapshot(self):
+        with self._lock:
+            series = {key: dict(value, buckets=list(value["buckets"])) for key, value in self._series.items()}
+            return series, {page: dict(value) for page, value in self._reruns.items()}
+
+    def page_stats(self):
+        """Per page: script runs, their mean and slowest wall time, and net resident memory added."""
+        _, reruns = self.snapshot()
+        return {
+            page: {
+                "reruns": data["count"],
+                "mean_ms": data["sum"] / data["count"] * 1000,
+                "max_ms": data["max"] * 1000,
+                "rss_delta_mib": data["rss_sum"] / 2**20,
+            }
+            for page, data in sorted(reruns.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._reruns.clear()
+
+
+metrics = Metrics()
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(registry=metrics):
+    """Render ``registry`` in the Prometheus text exposition format."""
+    series, reruns = registry.snapshot()
+    lines = [
+        "# HELP app_span_seconds Wall time of instrumented stages.",
+        "# TYPE app_span_seconds histogram",
+    ]
+    for (page, name), data in sorted(series.items()):
+        labels = f'page="{_label(page)}",span="{_label(name)}"'
+        for bound, count in zip(registry.buckets, data["buckets"]):
+            lines.append(f'app_span_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'app_span_seconds_bucket{{{labels},le="+Inf"}} {data["count"]}')
+        lines.append(f"app_span_seconds_sum{{{labels}}} {data['sum']:.6f}")
+        lines.append(f"app_span_seconds_count{{{labels}}} {data['count']}")
+    lines += ["# HELP app_span_seconds_max Slowest observation of each stage.", "# TYPE app_span_seconds_max gauge"]
+    for (page, name), data in sorted(series.items()):
+        lines.append(f'app_span_seconds_max{{page="{_label(page)}",span="{_label(name)}"}} {data["max"]:.6f}')
+    lines += [
+        "# HELP app_span_rss_delta_bytes_total Net resident memory change across each stage.",
+        "# TYPE app_span_rss_delta_bytes_total counter",
+    ]
+    for (page, name), data in sorted(series.items()):
+        lines.append(f'app_span_rss_delta_bytes_total{{page="{_label(page)}",span="{_label(name)}"}} {data["rss_sum"]}')
+    lines += ["# HELP app_reruns_total Completed script runs per page.", "# TYPE app_reruns_total counter"]
+    for page, data in sorted(reruns.items()):
+        lines.append(f'app_reruns_total{{page="{_label(page)}"}} {data["count"]}')
+    lines += ["# HELP app_rerun_seconds_total Wall time spent in script runs per page.",
+              "# TYPE app_rerun_seconds_total counter"]
+    for page, data in sorted(reruns.items()):
+        lines.append(f'app_rerun_seconds_total{{page="{_label(page)}"}} {data["sum"]:.6f}')
+    lines += ["# HELP app_rerun_rss_delta_bytes_total Net resident memory change across script runs per page.",
+              "# TYPE app_rerun_rss_delta_bytes_total counter"]
+    for page, data in sorted(reruns.items()):
+        lines.append(f'app_rerun_rss_delta_bytes_total{{page="{_label(page)}"}} {data["rss_sum"]}')
+    caches = registry.cache_stats()
+    for metric, field, kind, help_text in (
+        ("app_cache_hits_total", "hits", "counter", "Lookups served from the cache."),
+        ("app_cache_misses_total", "misses", "counter", "Lookups that had to compute the value."),
+        ("app_cache_entries", "entries", "gauge", "Entries currently held."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{_label(name)}"}} {stats[field]}' for name, stats in caches.items()]
+    rss = rss_bytes()
+    if rss is not None:
+        lines += ["# HELP app_process_rss_bytes Resident memory of this process.",
+                  "# TYPE app_process_rss_bytes gauge", f"app_process_rss_bytes {rss}"]
+    return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """The spans recorded during one script run of ``page``."""
+
+    def __init__(self, page, registry=metrics):
+        self.page = page
+        self.registry = registry
+        self.spans = []
+        self.started = time.perf_counter()
+        self.rss_start = rss_bytes()
+        self.seconds = None
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name):
+        rss_before = rss_bytes()
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            seconds = time.perf_counter() - start
+            rss_after = rss_bytes()
+            delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            self.spans.append(Span(name, start - self.started, seconds, delta, self._depth))
+            self.registry.observe(self.page, name, seconds, delta)
+
+    def finish(self):
+        """Close the trace (idempotent): record the rerun and emit its log line."""
+        if self.seconds is not None:
+            return self
+        self.seconds = time.perf_counter() - self.started
+        rss = rss_bytes()
+        self.registry.rerun(
+            self.page, self.seconds, rss - self.rss_start if rss is not None and self.rss_start is not None else None
+        )
+        if getattr(_local, "trace", None) is self:
+            _local.trace = None
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(self.as_dict()))
+        return self
+
+    def as_dict(self):
+        rss = rss_bytes()
+        return {
+            "event": "rerun",
+            "page": self.page,
+            "seconds": self.seconds,
+            "rss_bytes": rss,
+            "rss_delta": rss - self.rss_start if rss is not None and self.rss_start is not None else None,
+            # Spans are appended as they close; report them in start order
+            "spans": [asdict(span) for span in sorted(self.spans, key=lambda span: span.start)],
+        }
+
+
+_local = threading.local()
+
+
+def start_trace(page):
+    """Begin the trace for the current script run (one per thread)."""
+    _local.trace = Trace(page)
+    return _local.trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def span(name, page="-"):
+    """Time a stage within the current trace, or directly into ``metrics``."""
+    trace = current_trace()
+    if trace is not None:
+        with trace.span(name):
+            yield
+        return
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rss_after = rss_bytes()
+        delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        metrics.observe(page, name, time.perf_counter() - start, delta)
+
+
+def timed(name, page="-"):
+    """Decorator form of ``span``."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, page):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def debug_enabled():
+    if os.environ.get("APP_DEBUG", "").lower() in ("1", "true", "yes"):
+        return True
+    import streamlit as st
+    return st.query_params.get("debug") == "1"
+
+
+def show_debug_panel(trace):
+    """Finish ``trace`` and, when debugging is enabled, show it in the sidebar."""
+    import pandas as pd
+    import streamlit as st
+
+    trace.finish()
+    if not debug_enabled():
+        return
+    record = trace.as_dict()
+    with st.sidebar.expander("⏱️ Timings (this rerun)", expanded=True):
+        st.metric("Script run", f"{trace.seconds * 1000:,.1f} ms")
+        if record["rss_bytes"] is not None:
+            st.caption(f"RSS {record['rss_bytes'] / 2**20:,.1f} MiB "
+                       f"({(record['rss_delta'] or 0) / 2**20:+,.1f} MiB this run)")
+        table = pd.DataFrame(record["spans"], columns=["name", "start", "seconds", "rss_delta", "depth"])
+        table["name"] = ["  " * depth + name for name, depth in zip(table["name"], table["depth"])]
+        table["ms"] = table["seconds"] * 1000
+        table["rss_delta_kib"] = table["rss_delta"] / 1024
+        st.dataframe(table[["name", "ms", "rss_delta_kib"]], hide_index=True)
+        caches = metrics.cache_stats()
+        if caches:
+            st.caption("Process-wide caches")
+            st.dataframe(pd.DataFrame.from_dict(caches, orient="index"))
+        st.download_button("Download trace (JSON)", json.dumps(record, indent=2),
+                           file_name=f"{trace.page}-trace.json", mime="application/json")
+        st.download_button("Download metrics (Prometheus)", prometheus_text(),
+                           file_name="metrics.prom", mime="text/plain")
@@ -0,0 +1,27 @@
+"""Custom scikit-learn transformers used inside the saved model pipelines.
+
+They live in ``common`` rather than in the training code because unpickling a
+pipeline needs every class it contains to be importable by the apps.
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+
+
+class AppendPrediction(TransformerMixin, BaseEstimator):
+    """Append ``estimator``'s prediction as an extra, last feature column.
+
+    This is the task2 stacking step: a linear model is fitted on the inputs and
+    its prediction is passed on, next to the inputs, to the final model.
+    """
+
+    def __init__(self, estimator):
+        self.estimator = estimator
+
+    def fit(self, X, y):
+        self.estimator_ = clone(self.estimator).fit(X, y)
+        self.n_features_in_ = np.shape(X)[1]
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return np.column_stack([X, self.estimator_.predict(X)])
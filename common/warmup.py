@@ -0,0 +1,199 @@
+"""Pre-warm an app's models, datasets and heavy imports before sessions connect.
+
+Streamlit only executes an app script when a browser session connects, so the
+first visitor of a fresh container pays for every import, model unpickle and
+CSV parse.  Running the app through this launcher fills the same process-wide
+caches first and then hands over to ``streamlit run`` in-process::
+
+    python -m common.warmup task1 --run                 # from the repo root
+    python -m common.warmup task3 --run -- --server.port 8501
+    python -m common.warmup task2 --background --run    # serve while warming
+    python -m common.warmup all --run                   # all three apps in one process
+
+Without ``--run`` it only warms and prints how long each step took.  Every
+model and dataset has one copy in its task folder: task1/task2 paths are
+the constants below and task3's come from ``common.housing``, and the apps,
+server, training and benchmarks all resolve them from there.  Files that do
+not exist are skipped (the app reports them itself).  ``all`` warms every app
+for ``streamlit_app.py``, the multipage entry point that serves them together.
+"""
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from common.housing import HOUSING_DATASETS
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MATPLOTLIB_MODULES = ("matplotlib.figure", "matplotlib.backends.backend_agg")
+TASK3_MODULES = ("folium", "folium.plugins", "streamlit_folium", "plotly.express", "plotly.graph_objects")
+
+IRIS_CSV = os.path.join(ROOT_DIR, "task1", "iris.csv")
+IRIS_MODEL = os.path.join(ROOT_DIR, "task1", "model.pkl")
+ADVERTISING_CSV = os.path.join(ROOT_DIR, "task2", "Advertising.csv")
+ADVERTISING_MODEL = os.path.join(ROOT_DIR, "task2", "LR_model.pkl")
+
+
+@dataclass
+class Warmup:
+    script: str
+    models: tuple = ()
+    datasets: tuple = ()
+    modules: tuple = ()
+    # "module:function" hooks called with each model / each dataset path
+    model_hooks: tuple = ()
+    dataset_hooks: tuple = ()
+    # Other apps warmed first, for entry points that serve several
+    parts: tuple = ()
+
+
+APPS = {
+    "task1": Warmup(
+        os.path.join(ROOT_DIR, "task1", "app.py"),
+        models=(IRIS_MODEL,),
+        modules=MATPLOTLIB_MODULES,
+    ),
+    "task2": Warmup(
+        os.path.join(ROOT_DIR, "task2", "app.py"),
+        models=(ADVERTISING_MODEL,),
+        datasets=(ADVERTISING_CSV,),
+        modules=MATPLOTLIB_MODULES,
+        dataset_hooks=("common.browser:dataset_index",),
+    ),
+    "task3": Warmup(
+        os.path.join(ROOT_DIR, "task3", "app.py"),
+        models=tuple(spec.model_path for spec in HOUSING_DATASETS.values()),
+        datasets=tuple(spec.csv_path for spec in HOUSING_DATASETS.values()),
+        modules=TASK3_MODULES,
+        model_hooks=("common.features:get_house_encoder",),
+        dataset_hooks=("common.warmup:warm_listings",),
+    ),
+    "all": Warmup(os.path.join(ROOT_DIR, "streamlit_app.py"), parts=("task1", "task2", "task3")),
+}
+
+
+def warm_listings(path):
+    """Fill the caches the task3 page reads for the listings dataset at ``path``."""
+    from common.analytics import analytics_figures
+    from common.browser import dataset_index
+    from common.comparables import comparables_index
+    from common.geo import heatmap_data
+    from common.housing import dataset_for_csv
+
+    spec = dataset_for_csv(path)
+    if spec.heatmap:
+        heatmap_data(path)
+    analytics_figures(path, charts=spec.charts)
+    comparables_index(path, spec)
+    dataset_index(path)
+
+
+def _resolve(hook):
+    module, _, name = hook.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _step(timings, label, fn, *args):
+    start = time.perf_counter()
+    try:
+        fn(*args)
+        status = "ok"
+    except Exception as exc:
+        status = f"failed: {type(exc).__name__}: {exc}"
+    timings.append((label, time.perf_counter() - start, status))
+
+
+def warm(name):
+    """Warm everything the ``name`` app touches; returns ``(step, seconds, status)``."""
+    from common.datasets import load_dataset
+    from common.models import load_model
+
+    spec = APPS[name]
+    timings = []
+    for part in spec.parts:
+        timings += warm(part)
+    for module in spec.modules:
+        _step(timings, f"import {module}", importlib.import_module, module)
+    for path in spec.models:
+        label = os.path.relpath(path)
+        if not os.path.exists(path):
+            timings.append((f"model {label}", 0.0, "skipped: not found"))
+            continue
+        _step(timings, f"model {label}", load_model, path)
+        for hook in spec.model_hooks:
+            _step(timings, f"{hook} {label}", lambda path=path, hook=hook: _resolve(hook)(load_model(path)))
+    for path in spec.datasets:
+        label = os.path.relpath(path)
+        if not os.path.exists(path):
+            timings.append((f"dataset {label}", 0.0, "skipped: not found"))
+            continue
+        _step(timings, f"dataset {label}", load_dataset, path)
+        for hook in spec.dataset_hooks:
+            _step(timings, f"{hook} {label}", lambda path=path, hook=hook: _resolve(hook)(path))
+    return timings
+
+
+def warm_in_background(name):
+    """Start ``warm(name)`` on a daemon thread and return the thread.
+
+    Sessions that connect before it finishes block on the same cache locks
+    instead of loading a second copy.
+    """
+    thread = threading.Thread(target=warm, args=(name,), name=f"warmup-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+_warming = {}
+_warming_lock = threading.Lock()
+
+
+def ensure_warm(name):
+    """``warm_in_background(name)`` once per process; later calls return the same thread."""
+    with _warming_lock:
+        thread = _warming.get(name)
+        if thread is None:
+            thread = _warming[name] = warm_in_background(name)
+        return thread
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    streamlit_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, streamlit_args = argv[:split], argv[split + 1:]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("app", choices=sorted(APPS))
+    parser.add_argument("--run", action="store_true", help="start the Streamlit app in this process afterwards")
+    parser.add_argument("--background", action="store_true", help="warm on a thread while the server starts")
+    args = parser.parse_args(argv)
+
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    if args.background:
+        # Under ``python -m`` this file runs as __main__, a second copy of the
+        # module; register the thread in the one the apps import, so their
+        # ensure_warm() finds it instead of warming everything again
+        importlib.import_module("common.warmup").ensure_warm(args.app)
+    else:
+        start = time.perf_counter()
+        for label, seconds, status in warm(args.app):
+            print(f"{label:<60} {seconds * 1000:9.1f} ms  {status}", file=sys.stderr)
+        print(f"{'total':<60} {(time.perf_counter() - start) * 1000:9.1f} ms", file=sys.stderr)
+
+    if args.run:
+        from streamlit.web import cli
+
+        sys.argv = ["streamlit", "run", APPS[args.app].script, *streamlit_args]
+        return cli.main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
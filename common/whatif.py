@@ -0,0 +1,126 @@
+"""What-if price surfaces for the task3 models.
+
+A surface is a model's price over a grid of inputs: the property's own inputs
+with a few of them swept, e.g. Area 500-10000 x bedrooms 1-5 x each sidebar
+location.  Every grid point is written into one preallocated encoded matrix
+(``HouseFeatureEncoder.transform_columns``) and the whole grid is priced with
+a single batched predict, instead of one full rerun per slider position.
+
+Surfaces are shared across sessions in a bounded LRU keyed on the model
+version, the inputs held fixed and the grid, like single predictions in
+``common.predictions``; hit/miss counts are exported as ``cache="whatif"``.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.cache import LRUCache
+from common.features import get_house_encoder
+from common.models import model_version
+from common.predictions import TTL_SECONDS, row_key
+from common.telemetry import metrics
+
+# Points along the swept input, and most levels kept for every other axis
+SWEEP_POINTS = 50
+MAX_LEVELS = 8
+MAX_SURFACES = 256
+PRICE_COLUMN = "Price"
+
+surface_cache = LRUCache(max_entries=MAX_SURFACES, ttl=TTL_SECONDS)
+metrics.track_cache("whatif", surface_cache)
+
+
+@dataclass
+class PriceSurface:
+    # Grid values per swept column, in axis order
+    axes: dict
+    # One dimension per axis
+    prices: np.ndarray
+
+    def select(self, fixed):
+        """The sub-surface with the columns of ``fixed`` held at (the level nearest) its values."""
+        index = []
+        axes = {}
+        for column, values in self.axes.items():
+            if column in fixed:
+                index.append(level_index(values, fixed[column]))
+            else:
+                index.append(slice(None))
+                axes[column] = values
+        return PriceSurface(axes, self.prices[tuple(index)])
+
+    def frame(self):
+        """Long-form table: one row per grid point with its ``Price``."""
+        grid = np.indices(self.prices.shape).reshape(self.prices.ndim, -1)
+        data = {column: np.asarray(values)[grid[i]] for i, (column, values) in enumerate(self.axes.items())}
+        data[PRICE_COLUMN] = self.prices.ravel()
+        return pd.DataFrame(data)
+
+
+def level_index(values, value):
+    # Exact match for categories; nearest level for numbers
+    values = list(values)
+    if value in values:
+        return values.index(value)
+    try:
+        return int(np.argmin(np.abs(np.asarray(values, dtype=np.float64) - float(value))))
+    except (TypeError, ValueError):
+        raise KeyError(f"{value!r} is not on the grid") from None
+
+
+def sweep(low, high, points=SWEEP_POINTS, integer=False):
+    """``points`` evenly spaced values from ``low`` to ``high`` (each integer once when ``integer``)."""
+    values = np.linspace(low, high, points)
+    return np.unique(np.round(values).astype(np.int64)) if integer else values
+
+
+def levels(series, current=None, max_levels=MAX_LEVELS):
+    """Grid levels for a dataset column: its most common categories or spread-out numbers.
+
+    ``current`` (the property's own value) is always one of them.
+    """
+    values = series.dropna()
+    if isinstance(series.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(series):
+        chosen = values.value_counts().index[:max_levels].tolist()
+        if current is not None and current not in chosen:
+            chosen.append(current)
+        return chosen
+    chosen = np.unique(values)
+    if len(chosen) > max_levels:
+        chosen = np.unique(np.quantile(values, np.linspace(0, 1, max_levels), method="nearest"))
+    if current is not None:
+        chosen = np.union1d(chosen, [current])
+    return chosen.tolist()
+
+
+def grid_columns(base, axes):
+    """``({column: values}, n_rows)`` for every combination of ``axes``, other inputs taken from ``base``."""
+    shape = tuple(len(values) for values in axes.values())
+    n_rows = int(np.prod(shape))
+    grid = np.indices(shape).reshape(len(shape), -1)
+    columns = {
+        column: np.full(n_rows, value, dtype=object)
+        for column, value in base.items() if column not in axes
+    }
+    for i, (column, values) in enumerate(axes.items()):
+        columns[column] = np.asarray(values, dtype=object)[grid[i]]
+    return columns, n_rows
+
+
+def build_surface(model, base, axes):
+    columns, n_rows = grid_columns(base, axes)
+    prices = get_house_encoder(model).predict_columns(columns, n_rows)
+    return PriceSurface(dict(axes), np.asarray(prices, dtype=np.float64).reshape([len(v) for v in axes.values()]))
+
+
+def price_surface(model_path, model, base, axes):
+    """The price surface of ``model`` over ``axes``, reusing an earlier one for the same model version.
+
+    ``base`` is the property's record; ``axes`` maps each swept column to its
+    grid values.  Surfaces are shared between sessions and must not be mutated.
+    """
+    axes = {column: list(values) for column, values in axes.items()}
+    fixed = {column: value for column, value in base.items() if column not in axes}
+    key = (model_version(model_path), row_key(fixed), row_key([[column, values] for column, values in axes.items()]))
+    return surface_cache.get_or_build(key, lambda: build_surface(model, base, axes))
@@ -0,0 +1,86 @@
+"""All three apps as pages of one Streamlit process.
+
+    streamlit run streamlit_app.py
+    python -m common.warmup all --run     # preload everything before serving
+
+Every page resolves its files to the single copy in its task folder
+(``common.warmup`` / ``common.housing``), so it runs from any working
+directory, as do the separate deployments.  The pages share the process-wide
+model registry, dataset cache and derived caches, so every model and CSV is
+loaded once for all pages and sessions; the first session of a fresh process
+starts warming all of them in the background (``common.warmup``).  The
+"Server Status" page reports per-page latency and memory.
+"""
+import os
+import sys
+
+import streamlit as st
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+from common.warmup import ensure_warm
+
+
+def server_status():
+    import pandas as pd
+
+    from common.datasets import datasets
+    from common.models import registry
+    from common.telemetry import metrics, rss_bytes
+
+    st.title("📊 Server Status")
+    warming = ensure_warm("all")
+    rss = rss_bytes()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Resident memory", f"{rss / 2**20:,.0f} MiB" if rss is not None else "n/a")
+    col2.metric("Models loaded", len(registry.loaded()))
+    col3.metric("Datasets loaded", len(datasets.loaded()))
+    if warming.is_alive():
+        st.info("Still preloading models and datasets.")
+
+    # Memory is the net change in resident size across a page's runs, so the
+    # page that first loaded a shared model or dataset is the one charged for it
+    st.subheader("Pages")
+    pages = metrics.page_stats()
+    if pages:
+        st.dataframe(pd.DataFrame.from_dict(pages, orient="index"))
+    else:
+        st.caption("No page has run yet.")
+
+    st.subheader("Stages")
+    series, _ = metrics.snapshot()
+    if series:
+        st.dataframe(pd.DataFrame(
+            [
+                {
+                    "page": page, "span": name, "count": data["count"],
+                    "mean_ms": data["sum"] / data["count"] * 1000, "max_ms": data["max"] * 1000,
+                    "rss_delta_mib": data["rss_sum"] / 2**20,
+                }
+                for (page, name), data in sorted(series.items())
+            ]
+        ), hide_index=True)
+
+    st.subheader("Shared caches")
+    col1, col2 = st.columns(2)
+    col1.dataframe(pd.DataFrame({"model": [os.path.relpath(path, ROOT_DIR) for path in registry.loaded()]}),
+                   hide_index=True)
+    col2.dataframe(pd.DataFrame({"dataset": [os.path.relpath(path, ROOT_DIR) for path in datasets.loaded()]}),
+                   hide_index=True)
+    caches = metrics.cache_stats()
+    if caches:
+        st.dataframe(pd.DataFrame.from_dict(caches, orient="index"))
+
+
+pages = st.navigation([
+    st.Page(os.path.join(ROOT_DIR, "task1", "app.py"), title="Iris Prediction", icon="🌸", url_path="task1",
+            default=True),
+    st.Page(os.path.join(ROOT_DIR, "task2", "app.py"), title="Sales Prediction", icon="📈", url_path="task2"),
+    st.Page(os.path.join(ROOT_DIR, "task3", "app.py"), title="Real Estate", icon="🏡", url_path="task3"),
+    st.Page(server_status, title="Server Status", icon="📊", url_path="status"),
+])
+# Preload every page's models and datasets once per process; sessions that
+# arrive first wait on the same cache locks rather than loading a second copy
+ensure_warm("all")
+pages.run()
@@ -1,20 +1,37 @@
-import joblib
 import os
+import sys
 import streamlit as st
-import matplotlib.pyplot as plt
 import pandas as pd
-from io import StringIO
-import qrcode
 from io import BytesIO
 
+# Make the shared ``common`` package importable when run via ``streamlit run task1/app.py``
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+from common.inference import fast_predict
+from common.ingest import PREDICTION_COLUMN, ingest_csv
+from common.models import describe_model, load_model, model_version
+from common.plots import render_feature_grid
+from common.predictions import cached_predict
+from common.stats import OPERATIONS, frame_stats_table
+from common.telemetry import show_debug_panel, span, start_trace
+from common.warmup import IRIS_MODEL
+
+# Per-rerun timing spans; shown in the sidebar with ?debug=1
+trace = start_trace("task1")
+
 # Set page configuration
 st.set_page_config(page_title="ML Prediction App", layout="wide")
 
 # Load model
-model_path = 'model.pkl'
+model_path = IRIS_MODEL
 if os.path.exists(model_path):
-    model = joblib.load(model_path)
+    with span("model.load"):
+        model = load_model(model_path)
     st.success("Model loaded successfully!")
+    model_summary = describe_model(model_path)
+    if model_summary:
+        st.caption(model_summary)
 else:
     st.error(f"Model file not found at {model_path}. Please upload the model file.")
 
@@ -33,6 +50,8 @@ st.sidebar.subheader("QR Code Generator")
 website_url = "https://task1-ml-app.streamlit.app/#multiple-visualizations"
 qr_button = st.sidebar.button("Generate QR Code")
 if qr_button and website_url:
+    # Imported on first click; most sessions never generate a code
+    import qrcode
     qr = qrcode.make(website_url)
     buf = BytesIO()
     qr.save(buf)
@@ -59,7 +78,7 @@ input_data = ""
 if data_source == "Upload CSV":
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
     if uploaded_file:
-        input_data = uploaded_file.read().decode("utf-8")
+        input_data = uploaded_file
 elif data_source == "Enter Data Manually":
     input_data = st.text_area(
         "Enter your data in CSV format (comma separated values):",
@@ -67,110 +86,94 @@ elif data_source == "Enter Data Manually":
         height=100
     )
 
+# Rows of batch output rendered in the page; the CSV download has all of them
+PREVIEW_ROWS = 1000
+
+def ingest_upload(uploaded_file):
+    # Parse, score and summarize the upload once; reruns reuse the result
+    key = (getattr(uploaded_file, "file_id", uploaded_file.name), model_version(model_path))
+    # Keyed by page: the multipage entry point shares session state between the apps
+    if st.session_state.get("task1:upload_key") != key:
+        with span("ingest.csv"):
+            st.session_state["task1:upload"] = ingest_csv(uploaded_file, model, preview_rows=PREVIEW_ROWS)
+        st.session_state["task1:upload_key"] = key
+    return st.session_state["task1:upload"]
+
 # Prediction section with a loading spinner
+upload = None
 if input_data:
     with st.spinner('Predicting...'):
         try:
             if data_source == "Upload CSV":
-                df = pd.read_csv(StringIO(input_data))
-                data = df.iloc[0].values
+                # Batch mode: stream the upload in chunks, scoring each with one vectorized predict
+                upload = ingest_upload(uploaded_file)
+                st.success("Prediction successful!")
+                st.header("Predictions")
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Rows scored", f"{upload.rows:,}")
+                col2.metric("Time", f"{upload.predict_seconds:.3f} s")
+                col3.metric("Throughput", f"{upload.rows_per_sec:,.0f} rows/sec")
+                st.dataframe(upload.preview)
+                if upload.rows > PREVIEW_ROWS:
+                    st.caption(f"Showing the first {PREVIEW_ROWS:,} rows. Download the CSV for all results.")
+                st.download_button(
+                    "Download predictions as CSV",
+                    upload.scored_csv,
+                    file_name="predictions.csv",
+                    mime="text/csv"
+                )
             else:
                 data = [float(x) for x in input_data.split(",")]
-                
-            predictions = model.predict([data])
-            st.success("Prediction successful!")
-            st.header("Predictions")
-            st.write(predictions)
-        except ValueError:
-            st.error("Invalid input format. Please ensure all inputs are numeric and separated by commas.")
+                with span("predict"):
+                    # Scaling and trees in one fused NumPy call, shared across sessions per input row
+                    predictions = cached_predict(model_path, data, lambda: fast_predict(model, [data]))
+                st.success("Prediction successful!")
+                st.header("Predictions")
+                st.write(predictions)
+        except ValueError as e:
+            if data_source == "Upload CSV":
+                st.error(f"Could not score the uploaded file: {e}")
+            else:
+                st.error("Invalid input format. Please ensure all inputs are numeric and separated by commas.")
 
 # Real-time data visualization with multiple plot options
 st.header("Real-Time Data Visualization")
-if input_data:
+if input_data and (data_source != "Upload CSV" or upload is not None):
     if data_source == "Upload CSV":
-        df = pd.read_csv(StringIO(input_data))
+        # Plots use the preview rows; the operations below cover the whole upload
+        df = upload.preview.drop(columns=PREDICTION_COLUMN, errors="ignore").select_dtypes("number")
+        stats_table = upload.stats.table()
     else:
         data_dict = {f"Feature {i+1}": [float(x)] for i, x in enumerate(input_data.split(","))}
         df = pd.DataFrame(data_dict)
+        with span("stats.table"):
+            stats_table = frame_stats_table(df, key=input_data)
 
-    # Display 6 types of plots
-    st.subheader("Multiple Visualizations")
-
-    fig, axes = plt.subplots(2, 3, figsize=(18, 10))
-
-    # Bar Chart
-    axes[0, 0].bar(df.columns, df.iloc[0], color=plot_color, edgecolor='black')
-    axes[0, 0].set_title("Bar Chart", fontsize=14)
-    axes[0, 0].set_xlabel("Features", fontsize=12)
-    axes[0, 0].set_ylabel("Values", fontsize=12)
-
-    # Line Plot
-    axes[0, 1].plot(df.columns, df.iloc[0], color=plot_color, marker='o', linestyle='-', linewidth=2, markersize=8)
-    axes[0, 1].set_title("Line Plot", fontsize=14)
-    axes[0, 1].set_xlabel("Features", fontsize=12)
-    axes[0, 1].set_ylabel("Values", fontsize=12)
-    axes[0, 1].grid(True)
-
-    # Scatter Plot
-    axes[0, 2].scatter(df.columns, df.iloc[0], color=plot_color, s=100, edgecolors='black')
-    axes[0, 2].set_title("Scatter Plot", fontsize=14)
-    axes[0, 2].set_xlabel("Features", fontsize=12)
-    axes[0, 2].set_ylabel("Values", fontsize=12)
-
-    # Histogram
-    axes[1, 0].hist(df.iloc[0], bins=5, color=plot_color, edgecolor='black')
-    axes[1, 0].set_title("Histogram", fontsize=14)
-    axes[1, 0].set_xlabel("Values", fontsize=12)
-    axes[1, 0].set_ylabel("Frequency", fontsize=12)
-
-    # Pie Chart
-    axes[1, 1].pie(df.iloc[0], labels=df.columns, autopct='%1.1f%%', colors=[plot_color] * len(df.columns), startangle=90)
-    axes[1, 1].set_title("Pie Chart", fontsize=14)
-
-    # Box Plot
-    axes[1, 2].boxplot(df.iloc[0], vert=False, patch_artist=True, boxprops=dict(facecolor=plot_color))
-    axes[1, 2].set_title("Box Plot", fontsize=14)
-    axes[1, 2].set_xlabel("Values", fontsize=12)
-
-    # Adjust layout and show
-    plt.tight_layout()
-    st.pyplot(fig)
-
-    # Data distribution chart
-    st.header("Data Distribution")
-    st.bar_chart(df.transpose())
-
-    # Add interactive operations for visualizations
-    st.subheader("Perform Operations on Data")
-    operation = st.selectbox(
-        "Choose operation",
-        ["Sum", "Max", "Min", "Mean", "Median", "Standard Deviation", "Variance", "Range", "Skewness", "Kurtosis"]
-    )
+    if df.empty:
+        # Plots and operations are numeric; text columns such as class labels have nothing to draw
+        st.info("The uploaded file has no numeric columns to visualize.")
+    else:
+        # Display 6 types of plots
+        st.subheader("Multiple Visualizations")
+
+        # Rendered once per (first row, colour); unrelated widget changes reuse the cached PNG
+        with span("plot.grid"):
+            grid_png = render_feature_grid(df, plot_color)
+        st.image(grid_png, width="stretch")
+
+        # Data distribution chart
+        st.header("Data Distribution")
+        st.bar_chart(df.transpose())
 
-    # Perform the selected operation
-    if operation == "Sum":
-        result = df.sum().iloc[0]
-    elif operation == "Max":
-        result = df.max().iloc[0]
-    elif operation == "Min":
-        result = df.min().iloc[0]
-    elif operation == "Mean":
-        result = df.mean().iloc[0]
-    elif operation == "Median":
-        result = df.median().iloc[0]
-    elif operation == "Standard Deviation":
-        result = df.std().iloc[0]
-    elif operation == "Variance":
-        result = df.var().iloc[0]
-    elif operation == "Range":
-        result = df.max().iloc[0] - df.min().iloc[0]
-    elif operation == "Skewness":
-        result = df.skew().iloc[0]
-    elif operation == "Kurtosis":
-        result = df.kurtosis().iloc[0]
-
-    # Display the result
-    st.write(f"Result of {operation}: {result}")
+        # Add interactive operations for visualizations
+        st.subheader("Perform Operations on Data")
+        operation = st.selectbox("Choose operation", OPERATIONS)
+
+        # Every operation was computed in the same pass; just look the value up
+        result = stats_table.loc[operation].iloc[0]
+
+        # Display the result
+        st.write(f"Result of {operation}: {result}")
 
 # Footer with contact information and developer resume link
 st.markdown("---")
@@ -182,3 +185,5 @@ st.markdown("""
     **Developer Resume**
     You can view the developer's resume in PDF format [here](path_to_resume.pdf).
 """)
+
+show_debug_panel(trace)
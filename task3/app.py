@@ -1,11 +1,26 @@
 import streamlit as st
 import pandas as pd
-import joblib
 import os
-import folium
-import plotly.express as px
-from streamlit_folium import st_folium
-from folium.plugins import HeatMap
+import sys
+
+# Make the shared ``common`` package importable when run via ``streamlit run task3/app.py``
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+from common.analytics import analytics_figures
+from common.browser import show_dataset_browser
+from common.comparables import comparable_listings
+from common.datasets import load_dataset
+from common.features import predict_house_prices
+from common.geo import HYDERABAD_CENTER, heatmap_data
+from common.housing import HOUSING_DATASETS
+from common.models import describe_model, load_model
+from common.predictions import cached_predict
+from common.telemetry import show_debug_panel, span, start_trace
+from common.whatif import PRICE_COLUMN, levels, price_surface, sweep
+
+# Per-rerun timing spans; shown in the sidebar with ?debug=1
+trace = start_trace("task3")
 
 # Page Configuration
 st.set_page_config(
@@ -108,129 +123,249 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Dataset selection: each dataset has its own schema, model and cached analytics
+dataset_key = st.sidebar.selectbox(
+    "🗂️ Dataset", list(HOUSING_DATASETS), format_func=lambda key: HOUSING_DATASETS[key].label
+)
+spec = HOUSING_DATASETS[dataset_key]
+charts = spec.charts
+
 # Title and Description
 st.title("🏡 High-End Real Estate Price Prediction")
-st.markdown("""
-Welcome to the **Premium Real Estate Platform**. Use this tool to explore real estate trends in Hyderabad and predict house prices with advanced machine learning.
+st.markdown(f"""
+Welcome to the **Premium Real Estate Platform**. Use this tool to explore real estate trends in {spec.region or f"the {spec.label} dataset"} and predict house prices with advanced machine learning.
 """)
 
 # Load the Model
-model_path = "house_price_model.pkl"
+model_path = spec.model_path
+model_pipeline = None
 if os.path.exists(model_path):
-    model_pipeline = joblib.load(model_path)
+    with span("model.load"):
+        model_pipeline = load_model(model_path)
     st.success("✔️ Model loaded successfully!")
+    model_summary = describe_model(model_path)
+    if model_summary:
+        st.caption(model_summary)
 else:
-    st.error(f"❌ Model file not found at {model_path}. Please upload the model file.")
+    st.error(f"❌ Model file not found at {spec.model}. Build it with `python -m training.incremental {spec.key}`.")
+
+# Load Dataset (shared and typed; the sidebar ranges below come from it)
+csv_path = spec.csv_path
+dataset = None
+if os.path.exists(csv_path):
+    with span("dataset.load"):
+        dataset = load_dataset(csv_path)
 
 # Sidebar Inputs
 st.sidebar.header("🏠 Property Features")
+# Hyderabad choices and bounds, shared by the sidebar and the what-if grid
+HYDERABAD_LOCATIONS = ["Nizampet", "Hitech City", "Manikonda", "Gachibowli", "Kukatpally"]
+HYDERABAD_RANGES = {
+    'Area': (500, 10000),
+    'No. of Bedrooms': (1, 5),
+    'Bathrooms': (1, 5),
+    'CarParking': (0, 3),
+    'Age_of_Property': (0, 50),
+}
 def get_user_input():
-    area = st.sidebar.number_input("Area (sq ft)", min_value=500, max_value=10000, value=1500)
-    location = st.sidebar.selectbox("Location", ["Nizampet", "Hitech City", "Manikonda", "Gachibowli", "Kukatpally"])
-    bedrooms = st.sidebar.slider("Bedrooms", 1, 5, 3)
-    bathrooms = st.sidebar.slider("Bathrooms", 1, 5, 2)
-    parking = st.sidebar.slider("Parking Spaces", 0, 3, 1)
-    age_of_property = st.sidebar.slider("Property Age (years)", 0, 50, 5)
+    area = st.sidebar.number_input("Area (sq ft)", *HYDERABAD_RANGES['Area'], value=1500)
+    location = st.sidebar.selectbox("Location", HYDERABAD_LOCATIONS)
+    bedrooms = st.sidebar.slider("Bedrooms", *HYDERABAD_RANGES['No. of Bedrooms'], 3)
+    bathrooms = st.sidebar.slider("Bathrooms", *HYDERABAD_RANGES['Bathrooms'], 2)
+    parking = st.sidebar.slider("Parking Spaces", *HYDERABAD_RANGES['CarParking'], 1)
+    age_of_property = st.sidebar.slider("Property Age (years)", *HYDERABAD_RANGES['Age_of_Property'], 5)
     furnishing = st.sidebar.radio("Furnishing", ["Furnished", "Semi-Furnished", "Unfurnished"])
-    return pd.DataFrame({
-        'Area': [area],
-        'Location': [location],
-        'No. of Bedrooms': [bedrooms],
-        'Bathrooms': [bathrooms],
-        'CarParking': [parking],
-        'Age_of_Property': [age_of_property],
-        'Furnishing_Status': [furnishing]
-    })
-
-user_input = get_user_input()
-st.subheader("📋 Input Features")
-st.write(user_input)
-
-# Align Input Features for Prediction
-if 'Location' in user_input.columns:
-    # One-hot encoding for categorical features
-    user_input_encoded = pd.get_dummies(user_input, columns=['Location', 'Furnishing_Status'], drop_first=True)
-    
-    # Align with model's training features
-    required_columns = model_pipeline.feature_names_in_
-    for col in required_columns:
-        if col not in user_input_encoded.columns:
-            user_input_encoded[col] = 0
-    user_input_encoded = user_input_encoded[required_columns]
-
-    # Prediction
-    try:
-        prediction = model_pipeline.predict(user_input_encoded)[0]
-        st.subheader("💰 Predicted House Price")
-        st.metric(label="Estimated Price (₹)", value=f"{prediction:,.2f}")
-    except Exception as e:
-        st.error(f"Prediction error: {e}")
-else:
-    st.error("Input data is not formatted correctly for prediction!")
+    return {
+        'Area': area,
+        'Location': location,
+        'No. of Bedrooms': bedrooms,
+        'Bathrooms': bathrooms,
+        'CarParking': parking,
+        'Age_of_Property': age_of_property,
+        'Furnishing_Status': furnishing
+    }
 
-# Load Dataset
-csv_path = "Hyderabad.csv"
-if os.path.exists(csv_path):
-    dataset = pd.read_csv(csv_path)
+def get_dataset_input(spec, dataset):
+    # One widget per model input, with choices and ranges taken from the dataset
+    values = {}
+    for column in spec.inputs:
+        series = dataset[column]
+        if column in spec.categorical:
+            options = series.cat.categories.tolist() if hasattr(series, "cat") else sorted(series.dropna().unique())
+            values[column] = st.sidebar.selectbox(column, options, key=f"{spec.key}:{column}")
+        elif pd.api.types.is_integer_dtype(series):
+            values[column] = st.sidebar.number_input(
+                column, min_value=int(series.min()), max_value=int(series.max()),
+                value=int(series.median()), key=f"{spec.key}:{column}"
+            )
+        else:
+            values[column] = st.sidebar.number_input(
+                column, min_value=float(series.min()), max_value=float(series.max()),
+                value=float(series.median()), key=f"{spec.key}:{column}"
+            )
+    return values
 
-    # Display Dataset
-    st.subheader("📊 Real Estate Dataset")
-    st.dataframe(dataset.head(10))
+def what_if_axes(spec, dataset, user_input, swept):
+    # The swept input runs over its whole range; the others take a few levels each
+    if spec.key == "hyderabad":
+        axes = {swept: sweep(*HYDERABAD_RANGES[swept], integer=True)}
+        for column in spec.what_if:
+            if column == 'Location':
+                axes[column] = HYDERABAD_LOCATIONS
+            else:
+                low, high = HYDERABAD_RANGES[column]
+                axes[column] = list(range(low, high + 1))
+        return axes
+    series = dataset[swept]
+    axes = {swept: sweep(series.min(), series.max(), integer=pd.api.types.is_integer_dtype(series))}
+    for column in spec.what_if:
+        axes[column] = levels(dataset[column], user_input.get(column))
+    return axes
+
+def what_if_curves(spec, dataset, model_pipeline, user_input):
+    import plotly.express as px
+
+    levels_column, series_column = spec.what_if
+    # Only inputs the model was trained on can move the price; sweeping any other gives a flat curve
+    features = set(model_pipeline.feature_names_in_)
+    options = [column for column in spec.numeric if column in features and column not in spec.what_if]
+    swept = st.selectbox("Vary", options, key=f"{spec.key}:what-if")
+    # Every combination is encoded into one matrix and priced in a single
+    # batched predict; the surface is cached per model version and inputs
+    with span("whatif.surface", page="task3"):
+        surface = price_surface(
+            spec.model_path, model_pipeline, user_input, what_if_axes(spec, dataset, user_input, swept)
+        )
+
+    curves = surface.select({levels_column: user_input[levels_column]}).frame()
+    curves[series_column] = curves[series_column].astype(str)
+    st.plotly_chart(px.line(
+        curves, x=swept, y=PRICE_COLUMN, color=series_column,
+        title=f"Price vs {swept} at {user_input[levels_column]} {levels_column}",
+        template="plotly_white"
+    ), width="stretch")
+
+    heat = surface.select({series_column: user_input[series_column]})
+    st.plotly_chart(px.imshow(
+        heat.prices.T, x=heat.axes[swept], y=[str(level) for level in heat.axes[levels_column]],
+        labels={"x": swept, "y": levels_column, "color": PRICE_COLUMN}, aspect="auto", origin="lower",
+        title=f"Price by {swept} and {levels_column} in {user_input[series_column]}",
+        template="plotly_white"
+    ), width="stretch")
+    st.caption(f"{surface.prices.size:,} input combinations priced in one batch.")
+
+# The property inputs and the price form one fragment: changing an input reruns
+# only this function, so the price updates at once and the dataset, map and
+# charts below are left as they are. Spans name the page explicitly because a
+# fragment rerun has no trace of its own.
+@st.fragment
+def property_price(spec, dataset, model_pipeline):
+    if spec.key == "hyderabad":
+        user_input = get_user_input()
+    elif dataset is not None:
+        user_input = get_dataset_input(spec, dataset)
+    else:
+        user_input = {}
+    st.subheader("📋 Input Features")
+    st.write(pd.DataFrame([user_input]))
+
+    if user_input and model_pipeline is not None:
+        # Prediction: the precompiled encoder writes the row straight into the model's feature space;
+        # sidebar combinations already scored (by any session) come from the prediction cache
+        try:
+            with span("predict", page="task3"):
+                prediction = cached_predict(
+                    spec.model_path, user_input, lambda: predict_house_prices(model_pipeline, user_input)[0]
+                )
+            st.subheader("💰 Predicted House Price")
+            unit = f" ({spec.currency})" if spec.currency else ""
+            st.metric(label=f"Estimated Price{unit}", value=f"{prediction:,.2f}")
+        except Exception as e:
+            st.error(f"Prediction error: {e}")
+    elif not user_input:
+        st.error("Input data is not formatted correctly for prediction!")
+
+    if user_input and dataset is not None and spec.neighbours:
+        # Nearest listings come from the per-location KD-trees built once per
+        # dataset version, so an input change never scans the dataset
+        with span("comparables", page="task3"):
+            comparables = comparable_listings(spec.csv_path, user_input, spec=spec)
+        st.subheader("🏘️ Comparable Listings")
+        st.dataframe(comparables)
 
-    # Heatmap Visualization
+    if user_input and model_pipeline is not None and spec.what_if:
+        if st.toggle("📈 What-if price curves", key=f"{spec.key}:what-if-mode"):
+            st.subheader("📈 What-If Price Curves")
+            what_if_curves(spec, dataset, model_pipeline, user_input)
+
+# Searching and paging the dataset rerun only the browser; each rerun sends
+# a single page of the filtered rows
+@st.fragment
+def dataset_browser(csv_path, key):
+    with span("dataset.browse", page="task3"):
+        show_dataset_browser(csv_path, key=f"{key}:browser")
+
+# The map and the charts run in parallel fragments: on a full rerun Streamlit
+# hands them to its thread pool, so they compute alongside the rest of the
+# script and fill in when ready, and input changes never rerun them.
+@st.fragment(parallel=True)
+def heatmap_section(csv_path):
     st.subheader("🌏 Hyderabad Real Estate Heatmap")
-    if 'Latitude' in dataset.columns and 'Longitude' in dataset.columns:
-        map = folium.Map(location=[17.3850, 78.4867], zoom_start=11)
-        heat_data = [[row['Latitude'], row['Longitude'], row['Price']] for index, row in dataset.iterrows()]
-        HeatMap(heat_data, radius=15).add_to(map)
-        st_folium(map, width=800, height=500)
+    # Listings are geocoded from a local locality table and pre-binned onto a grid
+    with span("heatmap.data", page="task3"):
+        heat = heatmap_data(csv_path)
+    if heat.points:
+        # Map and chart libraries are imported where they are first used, so
+        # the page's first paint does not wait on them
+        import folium
+        from folium.plugins import HeatMap
+        from streamlit_folium import st_folium
+        map = folium.Map(location=list(HYDERABAD_CENTER), zoom_start=11)
+        HeatMap(heat.points, radius=15).add_to(map)
+        with span("heatmap.render", page="task3"):
+            # Nothing reads the map state back, so panning must not trigger reruns
+            st_folium(map, width=800, height=500, returned_objects=[])
+        st.caption(f"{heat.located:,} of {heat.total:,} listings mapped to {len(heat.points):,} grid cells.")
+    else:
+        st.info("No listings could be matched to map coordinates.")
+
+@st.fragment(parallel=True)
+def charts_section(csv_path, charts):
+    # Figures are built once per dataset version; a rerun only re-sends them
+    with span("analytics.summary", page="task3"):
+        summary, figures = analytics_figures(csv_path, charts=charts)
 
     # Price Distribution
-    st.subheader("📈 Price Distribution Across Locations")
-    fig = px.box(
-        dataset,
-        x="Location",
-        y="Price",
-        color="Location",
-        title="Interactive Price Distribution",
-        template="plotly_white"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.subheader(f"📈 Price Distribution by {charts.group}")
+    with span("charts.box", page="task3"):
+        st.plotly_chart(figures["box"], width="stretch")
 
     # Scatterplot: Area vs. Price
-    st.subheader("📊 Property Area vs Price with Detailed Hover Information")
-    fig = px.scatter(
-        dataset,
-        x="Area",
-        y="Price",
-        color="Location",
-        size="Price",
-        hover_name="Location",
-        hover_data=["Price", "Area", "No. of Bedrooms"],
-        title="Interactive Scatterplot of Property Features",
-        template="plotly_white"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.subheader(f"📊 Property {charts.area} vs {charts.value} with Detailed Hover Information")
+    with span("charts.scatter", page="task3"):
+        st.plotly_chart(figures["scatter"], width="stretch")
+        if len(summary.scatter_sample) < summary.total:
+            st.caption(f"Showing a uniform sample of {len(summary.scatter_sample):,} of {summary.total:,} listings.")
 
     # Amenities Analysis
-    st.subheader("🏢 Amenities Analysis")
-    amenities = [
-        "Gymnasium", "SwimmingPool", "JoggingTrack", "ClubHouse", "SportsFacility", 
-        "24X7Security", "PowerBackup", "LiftAvailable"
-    ]
-    amenity_counts = {amenity: dataset[amenity].sum() for amenity in amenities if amenity in dataset.columns}
-    amenity_df = pd.DataFrame(list(amenity_counts.items()), columns=["Amenity", "Count"])
-    fig = px.bar(
-        amenity_df,
-        x="Amenity",
-        y="Count",
-        title="Count of Properties with Key Amenities",
-        template="plotly_white"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    if figures["amenities"] is not None:
+        st.subheader("🏢 Amenities Analysis")
+        with span("charts.amenities", page="task3"):
+            st.plotly_chart(figures["amenities"], width="stretch")
+
+property_price(spec, dataset, model_pipeline)
+
+if dataset is not None:
+    # Display Dataset
+    st.subheader("📊 Real Estate Dataset")
+    dataset_browser(csv_path, spec.key)
+
+    if spec.heatmap:
+        heatmap_section(csv_path)
+    charts_section(csv_path, charts)
 
 else:
-    st.error(f"Dataset not found at {csv_path}. Please upload the file.")
+    st.error(f"Dataset not found at {spec.csv}. Please upload the file.")
 
 # Footer
 st.markdown("""
@@ -240,3 +375,5 @@ st.markdown("""
         <a href="mailto:balivadatarun@gmail.com">balivadatarun@gmail.com</a>.
     </footer>
 """, unsafe_allow_html=True)
+
+show_debug_panel(trace)
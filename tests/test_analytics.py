@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from common.analytics import ChartColumns, amenity_counts, build_figures, build_summary
+
+
+def test_box_plot_has_one_box_per_group_with_its_quartiles():
+    frame = pd.DataFrame({
+        "price": [1.0, 2.0, 3.0, 4.0, 10.0, 20.0, 30.0],
+        "zone": ["a", "a", "a", "a", "b", "b", "b"],
+        "size": [1, 2, 3, 4, 5, 6, 7],
+        "pool": [1, 0, 9, 1, 9, 1, 0],
+    })
+    charts = ChartColumns(value="price", group="zone", area="size", hover=(), amenities=("pool",))
+    box = build_figures(build_summary(frame, charts=charts), charts)["box"]
+    assert [trace.name for trace in box.data] == ["a", "b"]
+    assert len({trace.marker.color for trace in box.data}) == 2
+    assert box.layout.yaxis.title.text == "price"
+    for trace, (_, group) in zip(box.data, frame.groupby("zone")["price"]):
+        assert np.allclose([trace.q1[0], trace.median[0], trace.q3[0]], group.quantile([0.25, 0.5, 0.75]))
+
+
+def test_amenities_count_only_present_flags():
+    frame = pd.DataFrame({"Gymnasium": [1, 0, 9, 1], "lift": ["yes", "no", "yes", "yes"]})
+    counts = amenity_counts(frame, ("Gymnasium", "lift"))
+    assert counts.set_index("Amenity")["Count"].to_dict() == {"Gymnasium": 2, "lift": 3}
@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.artifacts import MODEL_FILE, ArtifactError, compiled_arrays, export_artifact, load_artifact
+from common.models import _joblib_load
+from common.warmup import IRIS_CSV, IRIS_MODEL
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    shutil.copy(IRIS_MODEL, path)
+    return path
+
+
+def iris_features(n=20):
+    return pd.read_csv(IRIS_CSV).select_dtypes("number").iloc[:n, :4].to_numpy()
+
+
+def test_exported_artifact_predicts_like_the_pickle(source):
+    import joblib
+
+    path = export_artifact(source, arrays=compiled_arrays(source))
+    loaded = load_artifact(path, source=source)
+    assert isinstance(loaded.arrays[next(iter(loaded.arrays))], np.memmap)
+    X = iris_features()
+    assert (loaded.model.predict(X) == joblib.load(source).predict(X)).all()
+
+
+def test_tampered_file_fails_the_manifest_checksum(source):
+    path = export_artifact(source)
+    with open(os.path.join(path, MODEL_FILE), "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    with pytest.raises(ArtifactError, match="manifest checksum"):
+        load_artifact(path, source=source)
+
+
+def test_stale_artifact_falls_back_to_the_pickle(source):
+    import joblib
+
+    path = export_artifact(source)
+    # Re-saving the model changes the pickle's bytes and so its checksum
+    joblib.dump(joblib.load(source), source, compress=0)
+    with pytest.raises(ArtifactError, match="stale"):
+        load_artifact(path, source=source)
+    # The registry's loader logs the stale artifact and unpickles the source instead
+    assert hasattr(_joblib_load(source), "predict")
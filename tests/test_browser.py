@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from common.browser import BrowseQuery, DatasetIndex, browse, slider_bounds
+from common.datasets import read_dataset
+from common.housing import HOUSING_DATASETS
+from common.warmup import ADVERTISING_CSV
+
+HYDERABAD_CSV = HOUSING_DATASETS["hyderabad"].csv_path
+
+
+@pytest.fixture(scope="module")
+def hyderabad():
+    frame = read_dataset(HYDERABAD_CSV, persist=False)
+    return frame, DatasetIndex(frame)
+
+
+def test_select_matches_pandas(hyderabad):
+    frame, index = hyderabad
+    query = BrowseQuery(
+        filters=(("Location", ("Gachibowli", "Kondapur")),), ranges=(("Area", 1000, 2000),),
+        flags=("Gymnasium", "SwimmingPool"), sort="Price", descending=True,
+    )
+    mask = (frame["Location"].isin(["Gachibowli", "Kondapur"]) & frame["Area"].between(1000, 2000)
+            & (frame["Gymnasium"] == 1) & (frame["SwimmingPool"] == 1))
+    expected = frame[mask].sort_values("Price", ascending=False, kind="stable")
+    selected = frame.iloc[index.select(query)]
+    assert len(selected) == len(expected) > 0
+    assert np.array_equal(selected["Price"].to_numpy(), expected["Price"].to_numpy())
+
+
+def test_flags_ignore_not_mentioned(hyderabad):
+    frame, index = hyderabad
+    assert "Gymnasium" in index.flags
+    assert len(index.select(BrowseQuery(flags=("Gymnasium",)))) == int((frame["Gymnasium"] == 1).sum())
+
+
+def test_pages_are_clamped():
+    frame = read_dataset(ADVERTISING_CSV, persist=False)
+    last = browse(ADVERTISING_CSV, page=10_000, page_size=15)
+    assert last.pages == -(-len(frame) // 15)
+    assert last.page == last.pages
+    assert last.start + len(last.rows) == last.matched == len(frame)
+
+
+def test_slider_bounds_share_the_column_type(hyderabad):
+    _, index = hyderabad
+    assert all(type(bound) is int for bound in slider_bounds(index, "Area"))
+    # Radio runs 0.0-49.6: a whole-number float bound must stay a float
+    bounds = slider_bounds(DatasetIndex(pd.DataFrame({"Radio": [0.0, 12.5, 49.6]})), "Radio")
+    assert bounds == (0.0, 49.6)
+    assert all(type(bound) is float for bound in bounds)
+
+
+def browser_page(csv_path):
+    from common.browser import show_dataset_browser
+
+    show_dataset_browser(csv_path, key="test")
+
+
+@pytest.mark.parametrize("column", ["Radio", "Newspaper", "Sales"])
+def test_range_filter_on_float_column(column):
+    app = AppTest.from_function(browser_page, args=(ADVERTISING_CSV,), default_timeout=60).run()
+    app.selectbox(key="test:range").set_value(column).run()
+    assert not app.exception
+    slider = app.slider(key=f"test:range:{column}")
+    low, high = slider.value
+    slider.set_value((low, (low + high) / 2)).run()
+    assert not app.exception
+    frame = read_dataset(ADVERTISING_CSV, persist=False)
+    matched = int(frame[column].between(low, (low + high) / 2).sum())
+    assert f"of {matched:,} matching" in app.caption[0].value
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from common.comparables import FLAG_WEIGHT, ComparablesIndex, build_index
+from common.datasets import read_dataset
+from common.housing import HOUSING_DATASETS
+
+
+def brute_force(frame, index, row, k):
+    # Distances from ``row`` to every listing of its location, scanning the frame
+    numeric = frame[index.neighbours].to_numpy(dtype=np.float64)
+    points = np.hstack([(numeric - index.center) / index.scale,
+                        (frame[index.flags].to_numpy() == 1) * FLAG_WEIGHT])
+    query = np.concatenate([(np.array([row[c] for c in index.neighbours], dtype=np.float64) - index.center)
+                            / index.scale, (np.array([row[c] for c in index.flags]) == 1) * FLAG_WEIGHT])
+    distance = np.sqrt(((points - query) ** 2).sum(axis=1))
+    distance[frame[index.partition].astype(str).to_numpy() != str(row[index.partition])] = np.inf
+    return np.sort(distance)[:k]
+
+
+def test_kd_trees_match_a_brute_force_scan():
+    spec = HOUSING_DATASETS["hyderabad"]
+    frame = read_dataset(spec.csv_path, persist=False)
+    index = build_index(frame, spec)
+    rows = frame.sample(50, random_state=0)
+    ids, distances = index.query(rows, k=5)
+    for (_, row), row_ids, row_distances in zip(rows.iterrows(), ids, distances):
+        expected = brute_force(frame, index, row, 5)
+        finite = np.isfinite(expected)
+        assert np.allclose(row_distances[finite], expected[finite])
+        assert (frame[spec.partition].iloc[row_ids[finite]].astype(str) == str(row[spec.partition])).all()
+
+
+def test_small_partitions_are_topped_up_from_the_rest():
+    frame = pd.DataFrame({"area": [100.0, 110.0, 500.0, 520.0, 540.0], "zone": ["a", "a", "b", "b", "b"]})
+    index = ComparablesIndex(frame, ["area"], partition="zone")
+    ids, distances = index.query({"area": 105.0, "zone": "a"}, k=4)
+    assert sorted(ids[0, :2]) == [0, 1]
+    assert list(ids[0, 2:]) == [2, 3]
+    assert np.all(np.diff(distances[0, 2:]) >= 0)
+    # Fewer listings than k: padded with -1 and inf
+    ids, distances = index.query({"area": 105.0, "zone": "a"}, k=7)
+    assert list(ids[0, 5:]) == [-1, -1] and np.isinf(distances[0, 5:]).all()
+
+
+def test_unknown_partition_searches_everything():
+    frame = pd.DataFrame({"area": [100.0, 110.0, 500.0], "zone": ["a", "a", "b"]})
+    ids, _ = ComparablesIndex(frame, ["area"], partition="zone").query({"area": 480.0, "zone": "z"}, k=1)
+    assert ids[0, 0] == 2
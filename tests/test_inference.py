@@ -0,0 +1,92 @@
+"""Compiled inference must score every shipped model exactly like scikit-learn."""
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.batch import feature_matrix
+from common.datasets import read_dataset
+from common.features import HouseFeatureEncoder
+from common.housing import HOUSING_DATASETS
+from common.inference import NATIVE_MIN_ROWS, get_compiled
+from common.warmup import ADVERTISING_CSV, ADVERTISING_MODEL, IRIS_CSV, IRIS_MODEL
+
+TABULAR_MODELS = {IRIS_MODEL: IRIS_CSV, ADVERTISING_MODEL: ADVERTISING_CSV}
+
+
+def chunks(n_rows):
+    # Smaller than NATIVE_MIN_ROWS, so the compiled path scores every row
+    step = NATIVE_MIN_ROWS // 2
+    return [slice(start, start + step) for start in range(0, n_rows, step)]
+
+
+def assert_same(actual, expected):
+    if expected.dtype.kind in "fc":
+        assert np.allclose(actual, expected, rtol=1e-9, atol=1e-9)
+    else:
+        assert np.array_equal(actual, expected)
+
+
+def as_pipeline_input(frame):
+    # The pipelines' imputers were fitted on plain object categories
+    return frame.astype({column: object for column in frame.select_dtypes("category").columns})
+
+
+@pytest.mark.parametrize("model_path, dataset", sorted(TABULAR_MODELS.items()))
+def test_tabular_models_match_sklearn(model_path, dataset):
+    model = joblib.load(model_path)
+    compiled = get_compiled(model)
+    assert compiled is not None
+    X = feature_matrix(model, read_dataset(dataset, persist=False))
+    for rows in chunks(len(X)):
+        assert_same(compiled.predict(X[rows]), model.predict(X[rows]))
+
+
+@pytest.fixture(scope="module", params=sorted(HOUSING_DATASETS))
+def housing(request):
+    spec = HOUSING_DATASETS[request.param]
+    model = joblib.load(spec.model_path)
+    encoder = HouseFeatureEncoder(model)
+    assert encoder.compiled
+    assert get_compiled(encoder._estimator) is not None
+    frame = read_dataset(spec.csv_path, persist=False)
+    return spec, model, encoder, as_pipeline_input(frame[encoder.feature_names])
+
+
+def assert_encoder_matches(model, encoder, frame):
+    for rows in chunks(len(frame)):
+        assert np.allclose(encoder.predict(frame.iloc[rows]), model.predict(frame.iloc[rows]), rtol=1e-6)
+
+
+def test_housing_models_match_sklearn(housing):
+    _, model, encoder, frame = housing
+    assert_encoder_matches(model, encoder, frame)
+
+
+def test_unknown_categories_are_ignored(housing):
+    spec, model, encoder, frame = housing
+    frame = frame.head(NATIVE_MIN_ROWS).copy()
+    for column in spec.categorical:
+        if column in frame.columns:
+            frame[column] = "not-a-category"
+    assert_encoder_matches(model, encoder, frame)
+
+
+def test_missing_values_are_imputed(housing):
+    _, model, encoder, frame = housing
+    frame = frame.head(NATIVE_MIN_ROWS).copy()
+    # Blank out a different column in each row, as read_csv leaves empty cells
+    for i in range(len(frame.columns)):
+        frame.iloc[i::len(frame.columns), i] = np.nan
+    assert frame.isna().any().all()
+    assert_encoder_matches(model, encoder, frame)
+
+
+def test_missing_inputs_score_as_zero():
+    spec = HOUSING_DATASETS["hyderabad"]
+    model = joblib.load(spec.model_path)
+    encoder = HouseFeatureEncoder(model)
+    row = {"Area": 1500.0, "Location": "Gachibowli", "No. of Bedrooms": 3.0}
+    expected = pd.DataFrame([{name: row.get(name, 0.0) for name in encoder.feature_names}])
+    assert np.allclose(encoder.predict(row), model.predict(as_pipeline_input(expected)))
@@ -0,0 +1,39 @@
+import io
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.ingest import PREDICTION_COLUMN, ingest_csv
+from common.warmup import IRIS_CSV, IRIS_MODEL
+
+
+def csv_buffer(text):
+    return io.BytesIO(text.encode())
+
+
+def test_chunked_scoring_matches_one_predict():
+    model = joblib.load(IRIS_MODEL)
+    with open(IRIS_CSV, "rb") as f:
+        result = ingest_csv(io.BytesIO(f.read()), model, chunk_size=40, preview_rows=10)
+    frame = pd.read_csv(IRIS_CSV)
+    scored = pd.read_csv(io.BytesIO(result.scored_csv()))
+    assert result.rows == len(frame) == len(scored)
+    assert len(result.preview) == 10
+    assert np.array_equal(scored[PREDICTION_COLUMN], model.predict(frame.iloc[:, :4].to_numpy()))
+    assert np.isclose(result.stats.table().loc["Sum", "sepal.length"], frame["sepal.length"].sum())
+
+
+def test_later_chunks_keep_the_first_chunks_columns():
+    # A blank cell would make the second chunk's "b" float and a number-only
+    # third chunk would make "label" numeric, if each chunk were typed on its own
+    result = ingest_csv(csv_buffer("a,b,label\n1,2,x\n3,4,y\n5,,z\n7,8,9\n"), chunk_size=2)
+    assert result.stats.columns == ["a", "b"]
+    assert result.rows == 4
+    assert np.isclose(result.stats.table().loc["Sum", "b"], 14.0)
+
+
+def test_mismatched_later_chunk_raises():
+    with pytest.raises(ValueError, match="Rows 3-4 do not match the column types"):
+        ingest_csv(csv_buffer("a,b\n1,2\n3,4\n5,oops\n"), chunk_size=2)
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import joblib
+import numpy as np
+import pytest
+
+from common.server import MODELS, InferenceApp
+from common.warmup import IRIS_MODEL
+
+
+def request(app, method, path, body=b"", content_type="application/json"):
+    """Run one HTTP request through the ASGI app; returns ``(status, decoded body)``."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path,
+             "headers": [(b"content-type", content_type.encode())]}
+    asyncio.run(app(scope, receive, send))
+    status = sent[0]["status"]
+    data = sent[1]["body"]
+    return status, json.loads(data) if dict(sent[0]["headers"])[b"content-type"] == b"application/json" else data
+
+
+@pytest.fixture(scope="module")
+def app():
+    return InferenceApp()
+
+
+def test_health_lists_every_model(app):
+    assert request(app, "GET", "/health") == (200, {"status": "ok", "models": sorted(MODELS)})
+
+
+def test_predict_batch_json_and_csv_agree_with_the_model(app):
+    rows = [[5.1, 3.5, 1.4, 0.2], [6.7, 3.0, 5.2, 2.3]]
+    expected = joblib.load(IRIS_MODEL).predict(np.asarray(rows)).tolist()
+    status, body = request(app, "POST", "/task1/predict_batch", json.dumps({"rows": rows}).encode())
+    assert status == 200 and body["predictions"] == expected
+    csv = b"sepal.length,sepal.width,petal.length,petal.width\n5.1,3.5,1.4,0.2\n6.7,3.0,5.2,2.3\n"
+    status, body = request(app, "POST", "/task1/predict_batch", csv, "text/csv")
+    assert status == 200 and body["predictions"] == expected
+
+
+def test_task3_takes_records_and_plain_lists(app):
+    record = {"Area": 1500, "Location": "Gachibowli", "No. of Bedrooms": 3, "Bathrooms": 2,
+              "CarParking": 1, "Age_of_Property": 5, "Furnishing_Status": "Furnished"}
+    status, by_name = request(app, "POST", "/task3/predict", json.dumps({"features": record}).encode())
+    assert status == 200
+    status, by_position = request(app, "POST", "/task3/predict",
+                                  json.dumps({"features": list(record.values())}).encode())
+    assert status == 200 and by_position["prediction"] == by_name["prediction"]
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("POST", "/nope/predict", b"{}", 404),
+    ("POST", "/task1/train", b"{}", 404),
+    ("GET", "/task1/predict", b"", 405),
+    ("POST", "/task1/predict", b"not json", 400),
+    ("POST", "/task1/predict_batch", b'{"rows": []}', 400),
+    ("POST", "/task1/predict", b'{"features": [1, 2]}', 400),
+])
+def test_bad_requests(app, method, path, body, status):
+    code, payload = request(app, method, path, body)
+    assert code == status
+    assert payload["error"]
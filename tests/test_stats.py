@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from common.stats import OPERATIONS, RunningStats
+
+
+def pandas_table(frame):
+    return pd.DataFrame([
+        frame.sum(), frame.max(), frame.min(), frame.mean(), frame.median(), frame.std(),
+        frame.var(), frame.max() - frame.min(), frame.skew(), frame.kurt(),
+    ], index=OPERATIONS)
+
+
+def test_chunked_merge_matches_pandas():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"a": rng.normal(5, 2, 1000), "b": rng.exponential(3, 1000)})
+    frame.loc[::7, "b"] = np.nan
+    stats = RunningStats(frame.columns)
+    # Uneven chunks, including a single row, exercise the pairwise merge
+    for start, stop in [(0, 1), (1, 300), (300, 301), (301, 1000)]:
+        stats.update(frame.iloc[start:stop])
+    assert np.allclose(stats.table().to_numpy(), pandas_table(frame).to_numpy())
+
+
+def test_columns_without_values_are_nan():
+    stats = RunningStats(["a", "b"])
+    stats.update(pd.DataFrame({"a": [1.0, 2.0], "b": [np.nan, np.nan]}))
+    table = stats.table()
+    assert table.loc["Sum", "a"] == 3.0
+    assert table[["b"]].drop(index="Sum").isna().all().all()
@@ -0,0 +1 @@
+"""Offline training pipeline for the three task models."""
@@ -0,0 +1,231 @@
+"""Batch-incremental training for the task3 listings models.
+
+New listings arrive in batches.  Each batch is folded into the installed
+model instead of retraining on every listing seen so far:
+
+* random forests (``warm_start``) gain ``--trees`` new trees fitted on the
+  batch.  Past ``--max-trees`` the oldest trees are dropped, so model size and
+  predict cost stay bounded however many listings have been seen;
+* gradient boosting (``warm_start``) gains ``--trees`` stages fitted to the
+  current model's residuals on the batch.
+
+The preprocessing (imputers, scaler, one-hot encoder) is fitted on the first
+batch and then frozen, so the feature layout the compiled encoder relies on
+never moves; categories first seen in a later batch are ignored
+(``handle_unknown="ignore"``) until the model is rebuilt.  Every batch is
+scored before it is folded in ("test-then-train"); the latest scores and
+the batch history go to the metrics sidecar the app shows.
+
+CSVs are read ``--batch-size`` rows at a time, so neither building nor
+updating ever holds a whole file in memory::
+
+    python -m training.incremental india                     # rebuild from task3/House Price India.csv
+    python -m training.incremental india new_listings.csv    # fold new listings into the installed model
+    python -m training.incremental india new.csv --append    # ... and append them to the dataset CSV
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import joblib  # noqa: E402
+import sklearn  # noqa: E402
+from sklearn.compose import ColumnTransformer  # noqa: E402
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from sklearn.impute import SimpleImputer  # noqa: E402
+from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error, r2_score  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from sklearn.preprocessing import OneHotEncoder, StandardScaler  # noqa: E402
+
+from common.datasets import read_batches  # noqa: E402
+from common.housing import HOUSING_DATASETS  # noqa: E402
+from common.models import metrics_path, model_metrics  # noqa: E402
+
+BATCH_SIZE = 5000
+TREES_PER_BATCH = 10
+MAX_TREES = 200
+# Bounds each tree's size, and with MAX_TREES the whole model's
+MAX_LEAF_NODES = 512
+RANDOM_STATE = 42
+# Batch records kept in the metrics sidecar
+HISTORY = 100
+
+BAGGING = ("RandomForestRegressor", "ExtraTreesRegressor")
+BOOSTING = ("GradientBoostingRegressor",)
+
+
+class NotIncremental(Exception):
+    """The installed model cannot be updated batch by batch."""
+
+
+def split(spec, frame, columns=None):
+    """Model inputs (``columns``, by default the dataset's ``inputs``) and target of ``frame``."""
+    X = frame[list(spec.inputs if columns is None else columns)]
+    # The encoder's imputer wants plain object categories
+    X = X.astype({column: object for column in X.select_dtypes("category").columns})
+    return X, frame[spec.target].to_numpy(dtype=np.float64)
+
+
+def build_pipeline(spec, trees=TREES_PER_BATCH, n_jobs=-1):
+    transformers = [(
+        "num", Pipeline([("imputer", SimpleImputer(strategy="mean")), ("scaler", StandardScaler())]),
+        list(spec.numeric),
+    )]
+    if spec.categorical:
+        transformers.append((
+            "cat", Pipeline([
+                ("imputer", SimpleImputer(strategy="most_frequent")),
+                ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=False)),
+            ]), list(spec.categorical),
+        ))
+    model = RandomForestRegressor(
+        n_estimators=trees, warm_start=True, max_leaf_nodes=MAX_LEAF_NODES, n_jobs=n_jobs,
+        random_state=RANDOM_STATE,
+    )
+    return Pipeline([("preprocessor", ColumnTransformer(transformers)), ("model", model)])
+
+
+def grow(pipeline, X, y, trees=TREES_PER_BATCH, max_trees=MAX_TREES, seed=RANDOM_STATE):
+    """Fold one batch into a fitted ``(preprocessor, model)`` pipeline."""
+    preprocessor, model = pipeline.steps[0][1], pipeline.steps[-1][1]
+    kind = type(model).__name__
+    if kind not in BAGGING + BOOSTING:
+        raise NotIncremental(f"{kind} cannot be updated batch by batch; retrain it with training.train")
+    # Fresh randomness per batch; warm_start would otherwise reuse the same tree seeds once trees are dropped
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees, random_state=seed)
+    model.fit(preprocessor.transform(X), y)
+    if kind in BAGGING and len(model.estimators_) > max_trees:
+        # An average can shed its oldest trees; boosting stages build on each other and cannot
+        del model.estimators_[:-max_trees]
+        model.set_params(n_estimators=max_trees)
+    return pipeline
+
+
+def evaluate(pipeline, X, y):
+    predictions = pipeline.predict(X)
+    scores = {"mae": mean_absolute_error(y, predictions), "mape": mean_absolute_percentage_error(y, predictions)}
+    if len(y) > 1:
+        scores["r2"] = r2_score(y, predictions)
+    return {key: float(value) for key, value in scores.items()}
+
+
+def fold(spec, pipeline, batches, state, trees=TREES_PER_BATCH, max_trees=MAX_TREES, n_jobs=-1,
+         append=False, log=print):
+    """Fold every frame of ``batches`` into ``pipeline`` (built on the first one when ``None``)."""
+    header = pd.read_csv(spec.csv_path, nrows=0).columns if append else None
+    for frame in batches:
+        start = time.perf_counter()
+        # An installed model keeps the columns it was first fitted on
+        X, y = split(spec, frame, getattr(pipeline, "feature_names_in_", None))
+        record = {"batch": state["batches"] + 1, "rows": len(frame)}
+        if pipeline is None:
+            pipeline = build_pipeline(spec, trees, n_jobs).fit(X, y)
+        else:
+            record["scores"] = evaluate(pipeline, X, y)
+            grow(pipeline, X, y, trees, max_trees, seed=RANDOM_STATE + state["batches"])
+        record["seconds"] = time.perf_counter() - start
+        state["batches"] += 1
+        state["rows"] += len(frame)
+        state["history"] = (state["history"] + [record])[-HISTORY:]
+        if "scores" in record:
+            state["holdout"] = record["scores"]
+        if append:
+            frame.reindex(columns=header).to_csv(spec.csv_path, mode="a", header=False, index=False)
+        log(f"{spec.key}: batch {record['batch']}: {len(frame):,} rows in {record['seconds']:.1f} s"
+            + "".join(f", {key}={value:.4f}" for key, value in record.get("scores", {}).items()))
+    return pipeline
+
+
+def save(spec, pipeline, state, batch_size, max_trees, log=print):
+    """Atomically replace the installed model and its metrics sidecar."""
+    model = pipeline.steps[-1][1]
+    version = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + f"-b{state['batches']}"
+    metrics = {
+        "task": f"task3-{spec.key}",
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "dataset": {"path": os.path.join("task3", spec.csv), "rows": state["rows"]},
+        "features": [str(column) for column in getattr(pipeline, "feature_names_in_", spec.inputs)],
+        "model_class": type(model).__name__,
+        "steps": [step for step, _ in pipeline.steps],
+        "incremental": {
+            "batches": state["batches"], "rows": state["rows"], "trees": len(model.estimators_),
+            "batch_size": batch_size, "max_trees": max_trees,
+        },
+        "holdout": state.get("holdout", {}),
+        "history": state["history"],
+        "versions": {"sklearn": sklearn.__version__, "joblib": joblib.__version__, "pandas": pd.__version__},
+    }
+    # Compressed: the fitted trees are mostly small integers and zeros
+    tmp = spec.model_path + ".tmp"
+    joblib.dump(pipeline, tmp, compress=3)
+    os.replace(tmp, spec.model_path)
+    sidecar = metrics_path(spec.model_path)
+    with open(sidecar + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(sidecar + ".tmp", sidecar)
+    log(f"{spec.key}: wrote {os.path.relpath(spec.model_path, ROOT_DIR)} ({version}, "
+        f"{len(model.estimators_)} trees, {os.path.getsize(spec.model_path):,} bytes)")
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", choices=sorted(HOUSING_DATASETS))
+    parser.add_argument("batches", nargs="*", metavar="csv",
+                        help="new listings to fold into the installed model (default: rebuild from the dataset)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows read and folded in at a time")
+    parser.add_argument("--trees", type=int, default=TREES_PER_BATCH, help="trees (or stages) added per batch")
+    parser.add_argument("--max-trees", type=int, default=MAX_TREES, help="forest size cap; oldest trees go first")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="cores used to fit each batch's trees")
+    parser.add_argument("--append", action="store_true", help="also append the new listings to the dataset CSV")
+    args = parser.parse_args(argv)
+    spec = HOUSING_DATASETS[args.dataset]
+
+    state = {"batches": 0, "rows": 0, "history": []}
+    if args.batches:
+        if not os.path.exists(spec.model_path):
+            parser.error(f"{spec.model} does not exist yet; build it first with: {args.dataset}")
+        pipeline = joblib.load(spec.model_path)
+        previous = model_metrics(spec.model_path) or {}
+        progress = previous.get("incremental", {})
+        state.update(batches=progress.get("batches", 0), rows=progress.get("rows", 0),
+                     history=previous.get("history", []))
+        batches = (
+            frame for path in args.batches
+            for frame in read_batches(path, args.batch_size, name=spec.csv)
+        )
+    else:
+        if args.append:
+            parser.error("--append needs new listings to append")
+        missing = [
+            column for column in (*spec.inputs, spec.target)
+            if column not in pd.read_csv(spec.csv_path, nrows=0).columns
+        ]
+        if missing:
+            parser.error(f"{spec.csv} has no {', '.join(missing)} column(s); retrain this model with training.train")
+        pipeline = None
+        batches = read_batches(spec.csv_path, args.batch_size)
+
+    try:
+        pipeline = fold(spec, pipeline, batches, state, args.trees, args.max_trees, args.n_jobs, args.append)
+    except NotIncremental as exc:
+        print(f"{spec.key}: {exc}", file=sys.stderr)
+        return 1
+    if pipeline is None:
+        print(f"{spec.key}: no rows to train on", file=sys.stderr)
+        return 1
+    save(spec, pipeline, state, args.batch_size, args.max_trees)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
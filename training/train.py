@@ -0,0 +1,324 @@
+"""Reproducible training for the task1/task2/task3 models.
+
+Replaces the hand-run notebooks with one command per model::
+
+    python -m training.train                      # all tasks
+    python -m training.train task3 --n-jobs 8
+    python -m training.train task1 --install      # also replace the model the app loads
+
+For each task the dataset is loaded once and split into train/holdout the way
+the notebooks did (20 %, ``random_state=42``).  A single ``GridSearchCV`` then
+searches every candidate model family and its hyperparameters with k-fold
+cross-validation, spread over ``--n-jobs`` worker processes.  The search
+pipelines are built with a ``joblib.Memory`` cache, so fitted preprocessing
+steps (scaler, encoder, stacking model) are computed once per fold and reused
+by every candidate that shares them.
+
+The refitted best pipeline -- preprocessing and model together, so the apps
+pass raw inputs and never re-derive features -- is written to
+``models/<task>/<version>/`` as ``model.pkl`` with a ``metrics.json`` next to
+it (CV results, holdout scores, dataset checksum, library versions);
+``models/<task>/latest.json`` points at the newest version.  ``--install`` copies the model over the pickle(s) the app
+loads and drops the metrics beside them as ``<stem>.metrics.json``, which the
+apps show under the "Model loaded" message.  ``--export-artifacts`` also
+writes the memory-mappable ``common.artifacts`` export for each installed
+pickle.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import joblib  # noqa: E402
+import sklearn  # noqa: E402
+from sklearn.compose import ColumnTransformer  # noqa: E402
+from sklearn.ensemble import (  # noqa: E402
+    GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor,
+)
+from sklearn.impute import SimpleImputer  # noqa: E402
+from sklearn.linear_model import LinearRegression  # noqa: E402
+from sklearn.metrics import (  # noqa: E402
+    accuracy_score, f1_score, mean_absolute_error, mean_absolute_percentage_error,
+    mean_squared_error, r2_score,
+)
+from sklearn.model_selection import GridSearchCV, KFold, StratifiedKFold, train_test_split  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from sklearn.preprocessing import OneHotEncoder, StandardScaler  # noqa: E402
+
+from common.artifacts import sha256  # noqa: E402
+from common.datasets import read_dataset  # noqa: E402
+from common.transformers import AppendPrediction  # noqa: E402
+
+MODELS_DIR = os.path.join(ROOT_DIR, "models")
+RANDOM_STATE = 42
+# Bounds each task3 forest tree, as training.incremental does, so the
+# installed pickle stays small enough to ship
+MAX_LEAF_NODES = 512
+TEST_SIZE = 0.2
+CV_FOLDS = 5
+
+
+@dataclass
+class TaskSpec:
+    name: str
+    dataset: str
+    # Pickles the app loads, relative to the repo root
+    install: tuple
+    classification: bool
+    scoring: str
+    grid: list = field(default_factory=list)
+    # Fit on a plain float matrix, the form the app passes at predict time
+    array_input: bool = False
+
+
+def load_iris(path):
+    data = read_dataset(path, persist=False)
+    X = data.iloc[:, :-1]
+    return X.fillna(X.mean()), data.iloc[:, -1]
+
+
+def load_advertising(path):
+    data = read_dataset(path, persist=False)
+    X = data.iloc[:, :-1]
+    return X.fillna(X.mean()), data.iloc[:, -1]
+
+
+def load_hyderabad(path):
+    data = read_dataset(path, persist=False)
+    # The encoder's imputer wants plain object categories, as in the notebook's read_csv
+    data = data.astype({column: object for column in data.select_dtypes("category").columns})
+    return data.iloc[:, 1:], data.iloc[:, 0]
+
+
+def iris_pipeline(memory):
+    return Pipeline([("scaler", StandardScaler()), ("model", RandomForestClassifier())], memory=memory)
+
+
+def advertising_pipeline(memory):
+    # Scaled inputs plus a linear model's prediction feed the final model (the notebook's stacking)
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("stack", AppendPrediction(LinearRegression())),
+        ("model", RandomForestRegressor()),
+    ], memory=memory)
+
+
+def hyderabad_pipeline(memory, X):
+    categorical = [column for column in X.columns if X[column].dtype == object]
+    numerical = [column for column in X.columns if column not in categorical]
+    preprocessor = ColumnTransformer([
+        ("num", Pipeline([("imputer", SimpleImputer(strategy="mean")), ("scaler", StandardScaler())]), numerical),
+        ("cat", Pipeline([
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore")),
+        ]), categorical),
+    ])
+    return Pipeline([("preprocessor", preprocessor), ("model", GradientBoostingRegressor())], memory=memory)
+
+
+TASKS = {
+    "task1": TaskSpec(
+        "task1", os.path.join("task1", "iris.csv"), (os.path.join("task1", "model.pkl"),),
+        classification=True, scoring="accuracy", array_input=True,
+        # The notebook's model family; only its hyperparameters are searched
+        grid=[
+            {
+                "model": [RandomForestClassifier(random_state=RANDOM_STATE)],
+                "model__n_estimators": [100, 300],
+                "model__max_depth": [None, 5],
+            },
+        ],
+    ),
+    "task2": TaskSpec(
+        "task2", os.path.join("task2", "Advertising.csv"), (os.path.join("task2", "LR_model.pkl"),),
+        classification=False, scoring="neg_mean_squared_error", array_input=True,
+        # The notebook's stack: a random forest over the inputs and a linear model's prediction
+        grid=[
+            {
+                "model": [RandomForestRegressor(random_state=RANDOM_STATE)],
+                "model__n_estimators": [100, 300],
+                "model__max_depth": [None, 8],
+            },
+        ],
+    ),
+    "task3": TaskSpec(
+        "task3", os.path.join("task3", "Hyderabad.csv"), (os.path.join("task3", "house_price_model.pkl"),),
+        classification=False, scoring="neg_mean_absolute_error",
+        grid=[
+            {"model": [LinearRegression()]},
+            {
+                "model": [RandomForestRegressor(random_state=RANDOM_STATE, max_leaf_nodes=MAX_LEAF_NODES)],
+                "model__n_estimators": [50, 100],
+            },
+            {
+                "model": [GradientBoostingRegressor(random_state=RANDOM_STATE)],
+                "model__n_estimators": [100, 300],
+                "model__learning_rate": [0.05, 0.1],
+                "model__max_depth": [3, 5],
+            },
+        ],
+    ),
+}
+
+LOADERS = {"task1": load_iris, "task2": load_advertising, "task3": load_hyderabad}
+
+
+def build_pipeline(name, memory, X):
+    if name == "task1":
+        return iris_pipeline(memory)
+    if name == "task2":
+        return advertising_pipeline(memory)
+    return hyderabad_pipeline(memory, X)
+
+
+def holdout_metrics(spec, y_true, y_pred):
+    if spec.classification:
+        return {
+            "accuracy": accuracy_score(y_true, y_pred),
+            "f1_macro": f1_score(y_true, y_pred, average="macro"),
+        }
+    return {
+        "mae": mean_absolute_error(y_true, y_pred),
+        "mse": mean_squared_error(y_true, y_pred),
+        "r2": r2_score(y_true, y_pred),
+        "mape": mean_absolute_percentage_error(y_true, y_pred),
+    }
+
+
+def _describe(value):
+    if hasattr(value, "get_params"):
+        return type(value).__name__
+    if isinstance(value, (np.generic,)):
+        return value.item()
+    return value
+
+
+def train(name, n_jobs=-1, output=MODELS_DIR, cv_folds=CV_FOLDS, log=print):
+    spec = TASKS[name]
+    dataset = os.path.join(ROOT_DIR, spec.dataset)
+    X, y = LOADERS[name](dataset)
+    features = [str(column) for column in X.columns]
+    if spec.array_input:
+        X = X.to_numpy(dtype=np.float64)
+    stratify = y if spec.classification else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=stratify
+    )
+    splitter = StratifiedKFold if spec.classification else KFold
+    cv = splitter(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
+
+    with tempfile.TemporaryDirectory(prefix=f"train-{name}-") as cache_dir:
+        memory = joblib.Memory(location=cache_dir, verbose=0)
+        search = GridSearchCV(
+            build_pipeline(name, memory, X), spec.grid, scoring=spec.scoring, cv=cv,
+            n_jobs=n_jobs, refit=True, error_score="raise",
+        )
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        search_seconds = time.perf_counter() - start
+        best = search.best_estimator_
+        # The cache directory is about to disappear; never pickle a reference to it
+        best.set_params(memory=None)
+
+    scores = holdout_metrics(spec, y_test, best.predict(X_test))
+    results = pd.DataFrame(search.cv_results_)
+    candidates = [
+        {
+            "params": {key: _describe(value) for key, value in params.items()},
+            "mean_score": float(mean),
+            "std_score": float(std),
+            "mean_fit_seconds": float(fit),
+            "rank": int(rank),
+        }
+        for params, mean, std, fit, rank in zip(
+            results["params"], results["mean_test_score"], results["std_test_score"],
+            results["mean_fit_time"], results["rank_test_score"],
+        )
+    ]
+    candidates.sort(key=lambda candidate: candidate["rank"])
+
+    data_sha = sha256(dataset)
+    version = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + "-" + data_sha[:8]
+    metrics = {
+        "task": name,
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "dataset": {"path": spec.dataset, "sha256": data_sha, "rows": int(len(X))},
+        "features": features,
+        "model_class": type(best.named_steps["model"]).__name__,
+        "steps": [step for step, _ in best.steps],
+        "best_params": {key: _describe(value) for key, value in search.best_params_.items()},
+        "cv": {"folds": cv_folds, "scoring": spec.scoring, "best_score": float(search.best_score_)},
+        "holdout": {key: float(value) for key, value in scores.items()},
+        "candidates": candidates,
+        "search_seconds": search_seconds,
+        "n_jobs": n_jobs,
+        "versions": {"sklearn": sklearn.__version__, "joblib": joblib.__version__, "pandas": pd.__version__},
+    }
+
+    version_dir = os.path.join(output, name, version)
+    os.makedirs(version_dir, exist_ok=True)
+    # Compressed, as training.incremental does: the fitted trees are mostly small integers and zeros
+    joblib.dump(best, os.path.join(version_dir, "model.pkl"), compress=3)
+    with open(os.path.join(version_dir, "metrics.json"), "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    with open(os.path.join(output, name, "latest.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": version, "path": os.path.relpath(version_dir, output)}, f, indent=2)
+
+    log(f"{name}: {len(candidates)} candidates x {cv_folds} folds in {search_seconds:.1f} s; "
+        f"best {metrics['model_class']} {spec.scoring}={search.best_score_:.4f}; holdout "
+        + ", ".join(f"{key}={value:.4f}" for key, value in metrics["holdout"].items()))
+    log(f"{name}: wrote {version_dir}")
+    return version_dir, metrics
+
+
+def install(name, version_dir, export=False, log=print):
+    """Copy a trained version over the pickle(s) the app loads, with its metrics."""
+    from common.models import metrics_path
+
+    for target in TASKS[name].install:
+        target = os.path.join(ROOT_DIR, target)
+        tmp = target + ".tmp"
+        shutil.copyfile(os.path.join(version_dir, "model.pkl"), tmp)
+        os.replace(tmp, target)
+        shutil.copyfile(os.path.join(version_dir, "metrics.json"), metrics_path(target))
+        log(f"{name}: installed {os.path.relpath(target, ROOT_DIR)}")
+        if export:
+            from common.artifacts import compiled_arrays, export_artifact
+
+            log(f"{name}: exported {export_artifact(target, arrays=compiled_arrays(target))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tasks", nargs="*", metavar="task", help=f"any of {', '.join(TASKS)} (default: all)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="worker processes for the search (-1: all cores)")
+    parser.add_argument("--cv", type=int, default=CV_FOLDS, help="cross-validation folds")
+    parser.add_argument("--output", default=MODELS_DIR, help="root of the versioned model directories")
+    parser.add_argument("--install", action="store_true", help="replace the pickles the apps load")
+    parser.add_argument("--export-artifacts", action="store_true", help="with --install, also export artifacts")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.tasks) - set(TASKS))
+    if unknown:
+        parser.error(f"unknown task(s): {', '.join(unknown)}")
+
+    for name in args.tasks or TASKS:
+        version_dir, _ = train(name, args.n_jobs, args.output, args.cv)
+        if args.install:
+            install(name, version_dir, args.export_artifacts)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())